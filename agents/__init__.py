@@ -3,7 +3,7 @@
 from .context_analyzer import ContextAnalyzerAgent
 from .web_researcher import WebResearchAgent
 from .story_generator import StoryGeneratorAgent
-from .script_segmenter import ScriptSegmentationAgent
+from .script_segmenter import ScriptSegmentationAgent, get_segmenter
 from .character_designer import CharacterDesignAgent
 from .video_assembler import VideoAssemblyAgent
 
@@ -12,6 +12,7 @@ __all__ = [
     "WebResearchAgent",
     "StoryGeneratorAgent",
     "ScriptSegmentationAgent",
+    "get_segmenter",
     "CharacterDesignAgent",
     "VideoAssemblyAgent",
 ]
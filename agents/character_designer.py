@@ -1,18 +1,144 @@
 """Character Design Agent for generating consistent character visuals."""
 
+import re
+import asyncio
+import hashlib
 import logging
-from typing import Dict, Any, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple, AsyncIterator, Awaitable
 from pathlib import Path
 
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate, SystemMessagePromptTemplate, HumanMessagePromptTemplate
+import openai
+from openai import AsyncOpenAI
+from tenacity import (
+    AsyncRetrying,
+    stop_after_attempt,
+    wait_exponential_jitter,
+    retry_if_exception_type,
+)
 
 from config import get_config
 from tools.image_gen_tool import ImageGenerationTool
-from utils.helpers import get_temp_path, sanitize_text
+from utils.helpers import get_temp_path, sanitize_text, fast_json_loads, stable_json_dumps, extract_json_text
+from utils.rate_limiter import get_llm_rate_limiter, get_image_rate_limiter, estimate_request_tokens
+from utils.cache import stable_hash, load_cached, save_cached, CharacterReferenceIndex
+from utils.circuit_breaker import CircuitBreaker
 
 logger = logging.getLogger(__name__)
 
+# Rough token cost of a vision analysis call (image input + 500 completion tokens)
+VISION_ANALYSIS_TOKEN_ESTIMATE = 1500
+
+# Transient LLM errors worth retrying with backoff (anything else fails immediately)
+RETRYABLE_LLM_ERRORS = (openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError)
+
+# Cache namespace for LLM character design responses
+LLM_CACHE_NAMESPACE = "char_llm_cache"
+
+# Basic image-generation design prompt used when no LLM description is available
+DESIGN_PROMPT_TEMPLATE = (
+    "{name}, a {char_type} character, with traits: {traits_str}, {art_style} style, "
+    "bright and colorful, child-friendly design, appropriate for {age_group} age group, "
+    "expressive and animated"
+)
+
+
+# Event loop running the async design pipeline, started on first use
+_DESIGN_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_DESIGN_LOOP_LOCK = threading.Lock()
+
+
+def _design_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the event loop that runs the async design pipeline for every entry point.
+    
+    A single long-lived loop (rather than asyncio.run per call) keeps the shared
+    AsyncOpenAI connection pool on one loop between calls and works whether or not
+    the calling thread already runs a loop of its own.
+    """
+    global _DESIGN_LOOP
+    with _DESIGN_LOOP_LOCK:
+        if _DESIGN_LOOP is None:
+            _DESIGN_LOOP = asyncio.new_event_loop()
+            threading.Thread(target=_DESIGN_LOOP.run_forever, name="character_design_loop", daemon=True).start()
+        return _DESIGN_LOOP
+
+
+def _run_sync(awaitable: Awaitable[Any]) -> Any:
+    """Run a coroutine on the shared design loop and block until it finishes."""
+    return asyncio.run_coroutine_threadsafe(awaitable, _design_loop()).result()
+
+
+async def _on_design_loop(awaitable: Awaitable[Any]) -> Any:
+    """Await a coroutine on the shared design loop, from that loop or any other."""
+    loop = _design_loop()
+    if asyncio.get_running_loop() is loop:
+        return await awaitable
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(awaitable, loop))
+
+
+@lru_cache(maxsize=None)
+def _design_client(api_key: Optional[str], base_url: Optional[str]) -> AsyncOpenAI:
+    """
+    Create the AsyncOpenAI client shared by every design agent calling the same account.
+    
+    Only used from the design loop, so its pooled connections never cross event loops.
+    SDK retries are disabled; transient errors are retried with backoff by the agent.
+    """
+    return AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0)
+
+
+@lru_cache(maxsize=256)
+def compile_character_patterns(char_name: str) -> tuple:
+    """
+    Compile (and memoize) the fallback text-parsing patterns for a character.
+    
+    Args:
+        char_name: Character name (escaped, so regex metacharacters are matched literally)
+        
+    Returns:
+        Tuple of compiled patterns, in priority order
+    """
+    name = re.escape(char_name)
+    flags = re.DOTALL | re.IGNORECASE
+    return (
+        re.compile(rf"\*\*{name}\*\*[:\-]?\s*(.+?)(?=\n\*\*|$)", flags),  # **Name**: description
+        re.compile(rf"#{{1,3}}\s*{name}[:\-]?\s*(.+?)(?=\n#|\n\n|$)", flags),  # # Name: description
+        re.compile(rf"{name}[:\-]\s*(.+?)(?=\n\n|\n[A-Z]|$)", flags),  # Name: description
+    )
+
+
+@lru_cache(maxsize=512)
+def build_design_prompt(
+    name: str,
+    char_type: str,
+    traits: tuple,
+    art_style: str,
+    age_group: str
+) -> str:
+    """
+    Build the basic image-generation design prompt for a character (memoized).
+    
+    Args:
+        name: Character name
+        char_type: Character type
+        traits: Tuple of character traits
+        art_style: Art style
+        age_group: Target age group
+        
+    Returns:
+        Design prompt string
+    """
+    return DESIGN_PROMPT_TEMPLATE.format(
+        name=name,
+        char_type=char_type,
+        traits_str=", ".join(traits) if traits else "friendly",
+        art_style=art_style,
+        age_group=age_group
+    )
+
 
 class CharacterDesignAgent:
     """Agent for generating consistent character visuals."""
@@ -24,16 +150,37 @@ class CharacterDesignAgent:
             workflow_id: Optional workflow ID to organize generated images by workflow execution
         """
         self.config = get_config()
-        self.llm = ChatOpenAI(
-            model_name=self.config.character_designer_llm.model,
-            temperature=self.config.character_designer_llm.temperature,
-            max_tokens=self.config.character_designer_llm.max_tokens,
-            api_key=self.config.character_designer_llm.api_key,
-            base_url=self.config.character_designer_llm.base_url
-        )
+        
+        # Call the OpenAI SDK directly: the design path is a single chat completion, so the
+        # LangChain message/callback layers only add per-call overhead under parallelism
+        llm_config = self.config.character_designer_llm
+        self.async_client = _design_client(llm_config.api_key, llm_config.base_url)
         self.image_tool = ImageGenerationTool(workflow_id=workflow_id)
         
-        # System prompt for character design
+        # Fail fast on reference generation while the image provider is down
+        retry_config = self.config.retry
+        self.image_circuit_breaker = CircuitBreaker(
+            "image_gen",
+            failure_threshold=retry_config.circuit_breaker_threshold,
+            reset_timeout=retry_config.circuit_breaker_reset_timeout
+        )
+        
+        # Persistent reference index shared across videos and pipeline runs
+        self.reference_index = CharacterReferenceIndex()
+        
+        # Character reference table reused across scene generation calls
+        self._char_ref_table: Dict[str, Dict[str, Any]] = {}
+        self._char_ref_source_key: Optional[str] = None
+        
+        # Proactive throttles so parallel calls stay under provider RPM/TPM limits
+        # (shared by every agent calling the same account, since the limits apply account-wide)
+        self.llm_rate_limiter = get_llm_rate_limiter(self.config.character_designer_llm)
+        # Vision analysis goes through the image tool's OpenAI client, so it counts against the image_gen account
+        self.vision_rate_limiter = get_llm_rate_limiter(self.config.image_gen)
+        self.image_rate_limiter = get_image_rate_limiter()
+        
+        # System prompt for character design. It is fully static (all per-request values
+        # live in the human prompt) so providers with prompt caching can reuse the prefix.
         self.system_prompt = """You are a character design expert for animated children's videos.
 
 Your role is to create detailed character design prompts that:
@@ -52,7 +199,18 @@ Ensure all designs are:
 - Bright and colorful
 - Child-friendly
 - Consistent in style
-- Appropriate for the target age group"""
+- Appropriate for the target age group
+
+For each character, provide a detailed visual design description suitable for image generation.
+Focus on physical appearance, clothing, colors, and distinctive features that match their personality traits.
+
+**IMPORTANT**: Some characters may not have predefined traits. For these characters, infer appropriate 
+personality traits and visual characteristics based on their type and role in the story context.
+
+**RESTRICTION**: Limit the design description within 3000 characters for each character.
+
+Format your response as a strict JSON array with one object per character, and nothing else:
+[{"name": "<Character Name>", "description": "<Detailed visual description including character type, physical features, clothing, colors, and personality-reflecting visual elements>"}]"""
 
         self.human_prompt = """Create character design descriptions for the following characters:
 
@@ -65,17 +223,6 @@ Context:
 Art Style: {art_style}
 Age Group: {age_group}
 
-For each character, provide a detailed visual design description suitable for image generation.
-Focus on physical appearance, clothing, colors, and distinctive features that match their personality traits.
-
-**IMPORTANT**: Some characters may not have predefined traits. For these characters, infer appropriate 
-personality traits and visual characteristics based on their type and role in the story context.
-
-**RESTRICTION**: Limit the design description within 3000 characters for each character.
-
-Format your response as follows for each character:
-**[Character Name]**: [Detailed visual description including character type, physical features, clothing, colors, and personality-reflecting visual elements]
-
 Create detailed character design descriptions and prompts for image generation.
 Focus on consistency and child-friendly aesthetics."""
 
@@ -87,6 +234,128 @@ Focus on consistency and child-friendly aesthetics."""
         """
         Generate character design descriptions and reference sheets.
         
+        Runs adesign_characters on the shared design event loop, so it can be called
+        from any thread, including one that already runs an event loop.
+        
+        Args:
+            context: Context dictionary with characters
+            art_style: Optional art style override
+            
+        Returns:
+            Dictionary mapping character names to design descriptions
+        """
+        return _run_sync(self._adesign_characters(context, art_style))
+    
+    @classmethod
+    def design_characters_batched(
+        cls,
+        contexts: List[Dict[str, Any]],
+        art_style: Optional[str] = None,
+        workflow_ids: Optional[List[Optional[str]]] = None
+    ) -> List[Dict[str, Dict[str, Any]]]:
+        """
+        Design characters for many videos, running the LLM design calls through the OpenAI Batch API.
+        
+        Intended for offline rendering where per-video latency does not matter: the design
+        prompts of every video are submitted as one discounted batch job. Reference images
+        are then generated per video through the regular (parallel) image pipeline.
+        
+        Args:
+            contexts: Context dictionaries, one per video
+            art_style: Optional art style override
+            workflow_ids: Optional workflow IDs (one per context) to organize generated images
+            
+        Returns:
+            List of character description dictionaries, in the order of contexts
+        """
+        from tools.batch_tool import OpenAIBatchTool
+        
+        if workflow_ids is None:
+            workflow_ids = [None] * len(contexts)
+        
+        agents = [cls(workflow_id=workflow_id) for workflow_id in workflow_ids]
+        if not agents:
+            return []
+        
+        config = agents[0].config
+        if art_style is None:
+            art_style = config.image_gen.style or "cartoon"
+        
+        # Collect design prompts not already answered by the response cache
+        llm_descriptions = [{} for _ in contexts]
+        batch_requests = {}
+        for index, (agent, context) in enumerate(zip(agents, contexts)):
+            characters = context.get("characters", [])
+            if not characters:
+                continue
+            
+            age_group = context.get("age_group", "6-8")
+            cached = load_cached(LLM_CACHE_NAMESPACE, agent._llm_cache_key(characters, context, art_style, age_group))
+            if cached:
+                llm_descriptions[index] = cached
+                continue
+            
+            batch_requests[f"video-{index}"] = agent._build_design_messages(characters, context, art_style, age_group)
+        
+        if batch_requests:
+            llm_config = config.character_designer_llm
+            try:
+                logger.info(f"Submitting {len(batch_requests)} character design prompt(s) to the Batch API")
+                responses = OpenAIBatchTool().run_chat_batch(
+                    batch_requests,
+                    model=llm_config.model,
+                    temperature=llm_config.temperature,
+                    max_tokens=llm_config.max_tokens
+                )
+            except Exception as e:
+                logger.warning(f"Batch character design failed: {e}. Using fallback method.")
+                responses = {}
+            
+            for custom_id, content in responses.items():
+                index = int(custom_id.split("-", 1)[1])
+                context = contexts[index]
+                characters = context.get("characters", [])
+                descriptions = agents[index]._parse_llm_design_output(sanitize_text(content), characters)
+                if descriptions:
+                    age_group = context.get("age_group", "6-8")
+                    save_cached(
+                        LLM_CACHE_NAMESPACE,
+                        agents[index]._llm_cache_key(characters, context, art_style, age_group),
+                        descriptions
+                    )
+                llm_descriptions[index] = descriptions
+        
+        async def design_one(agent: "CharacterDesignAgent", context: Dict[str, Any], descriptions: Dict[str, str]):
+            try:
+                return await agent._adesign_with_descriptions(
+                    context.get("characters", []),
+                    art_style,
+                    context.get("age_group", "6-8"),
+                    descriptions
+                )
+            except Exception as e:
+                logger.error(f"Error designing characters: {e}")
+                return agent._fallback_character_descriptions(context)
+        
+        async def design_all() -> List[Dict[str, Dict[str, Any]]]:
+            return list(await asyncio.gather(*(
+                design_one(agent, context, descriptions)
+                for agent, context, descriptions in zip(agents, contexts, llm_descriptions)
+            )))
+        
+        return _run_sync(design_all())
+    
+    async def adesign_characters(
+        self,
+        context: Dict[str, Any],
+        art_style: Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Async variant of design_characters that gathers all character designs concurrently.
+        
+        The work runs on the shared design loop (which owns the shared AsyncOpenAI
+        client), whichever event loop the caller awaits from.
+        
         Args:
             context: Context dictionary with characters
             art_style: Optional art style override
@@ -94,6 +363,14 @@ Focus on consistency and child-friendly aesthetics."""
         Returns:
             Dictionary mapping character names to design descriptions
         """
+        return await _on_design_loop(self._adesign_characters(context, art_style))
+    
+    async def _adesign_characters(
+        self,
+        context: Dict[str, Any],
+        art_style: Optional[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Design characters on the running (design) loop; see adesign_characters."""
         try:
             logger.info("Designing characters")
             
@@ -104,89 +381,12 @@ Focus on consistency and child-friendly aesthetics."""
             age_group = context.get("age_group", "6-8")
             
             # Use LLM to generate enhanced character design descriptions
-            character_descriptions = {}
-            
             if characters:
-                try:
-                    # Create prompt using the defined system and human prompts
-                    prompt = ChatPromptTemplate.from_messages([
-                        SystemMessagePromptTemplate.from_template(self.system_prompt),
-                        HumanMessagePromptTemplate.from_template(self.human_prompt)
-                    ])
-                    
-                    # Format characters for LLM input
-                    characters_str = "\n".join([
-                        f"- {char.get('name', 'Unknown')}: {char.get('type', 'character')} with traits: {', '.join(char.get('traits', []))}"
-                        for char in characters
-                    ])
-                    
-                    # Format context for LLM
-                    context_str = f"Theme: {context.get('theme', 'N/A')}\nSetting: {context.get('setting', 'N/A')}\nMoral Lesson: {context.get('moral_lesson', 'N/A')}"
-                    
-                    # Format prompt with input
-                    formatted_prompt = prompt.format_messages(
-                        characters=characters_str,
-                        context=context_str,
-                        art_style=art_style,
-                        age_group=age_group
-                    )
-                    
-                    # Call LLM
-                    logger.info("Generating character designs with LLM")
-                    response = self.llm.invoke(formatted_prompt)
-                    
-                    # Parse LLM response to extract character descriptions
-                    llm_descriptions = self._parse_llm_character_response(sanitize_text(response.content), characters)
-                    
-                except Exception as e:
-                    logger.warning(f"LLM character design generation failed: {e}. Using fallback method.")
-                    llm_descriptions = {}
+                llm_descriptions = await self._agenerate_llm_descriptions(characters, context, art_style, age_group)
             else:
                 llm_descriptions = {}
             
-            # Generate character descriptions and reference images
-            for char in characters:
-                char_name = char.get("name", "Unknown")
-                char_type = char.get("type", "unknown")
-                traits = char.get("traits", [])
-                
-                # Use LLM-generated description if available, otherwise create basic prompt
-                if char_name in llm_descriptions:
-                    design_prompt = llm_descriptions[char_name]
-                else:
-                    design_prompt = self._create_design_prompt(char, art_style, age_group)
-                
-                # Generate character reference image
-                logger.info(f"Generating reference image for {char_name}")
-                reference_image_path = self.image_tool.generate_character_reference(
-                    character_name=char_name,
-                    character_description=design_prompt,
-                    traits=traits,
-                    style=art_style
-                )
-                
-                # Analyze reference image with GPT-4 Vision to get detailed visual description
-                visual_analysis = None
-                if reference_image_path:
-                    visual_analysis = self.image_tool.analyze_character_image(
-                        image_path=reference_image_path,
-                        character_name=char_name,
-                        character_type=char_type
-                    )
-                
-                character_descriptions[char_name] = {
-                    "name": char_name,
-                    "type": char_type,
-                    "traits": traits,
-                    "description": design_prompt,
-                    "design_prompt": design_prompt,
-                    "visual_analysis": visual_analysis,  # Detailed description from GPT-4 Vision
-                    "reference_image_path": str(reference_image_path) if reference_image_path else None,
-                }
-            
-            logger.info(f"Character designs created for {len(character_descriptions)} characters")
-            
-            return character_descriptions
+            return await self._adesign_with_descriptions(characters, art_style, age_group, llm_descriptions)
             
         except Exception as e:
             logger.error(f"Error designing characters: {e}")
@@ -223,87 +423,41 @@ Focus on consistency and child-friendly aesthetics."""
             
             # Build complete character reference details once for all distinct characters
             # found in all segments before looping through script_segments
-            all_characters = set()
-            for segment in script_segments:
-                all_characters.update(segment.get("characters", []))
-            
-            logger.info(f"Building character references for {len(all_characters)} distinct character(s)")
-            
-            character_references = {}
-            for char_name in all_characters:
-                if char_name in character_descriptions:
-                    char_desc = character_descriptions[char_name]
-                    
-                    # Build comprehensive character reference
-                    char_type = char_desc.get("type", "character")
-                    traits = char_desc.get("traits", [])
-                    
-                    # Prioritize visual analysis from reference image if available
-                    visual_description = ""
-                    if char_desc.get("visual_analysis"):
-                        visual_description = char_desc["visual_analysis"]
-                    elif char_desc.get("description"):
-                        visual_description = char_desc["description"]
-
-                    # Get reference image path if available
-                    reference_image_path = char_desc.get("reference_image_path")
-                    
-                    # Build comprehensive character description for character_detail
-                    # Format: "Name (a type character with traits: trait1, trait2; visual details)"
-                    char_desc_parts = [f"a {char_type}"]
-                    
-                    if traits:
-                        traits_str = ", ".join(traits[:3])  # Limit to top 3 traits
-                        char_desc_parts.append(f"with traits: {traits_str}")
-                    
-                    if visual_description:
-                        char_desc_parts.append(visual_description)
-                    
-                    full_char_desc = " ".join(char_desc_parts)
-                    character_detail = f"{char_name} ({full_char_desc})"
-                    
-                    # Summarize character_detail if it exceeds 800 characters
-                    if len(character_detail) > 800:
-                        logger.info(f"Character detail for {char_name} is {len(character_detail)} chars, summarizing...")
-                        character_detail = self.image_tool.summarize_character_descriptions(
-                            character_detail, 
-                            max_length=800
-                        )
-                    
-                    # Create complete character reference dictionary
-                    character_references[char_name] = {
-                        "character_detail": character_detail,
-                        "reference_image_path": reference_image_path,
-                    }
-                    
-                    logger.debug(f"Character {char_name}: type={char_type}, traits={traits[:3]}, has_visual_desc={bool(visual_description)}, has_ref_image={bool(reference_image_path)}")
-            
-            # Now loop through segments to generate scene images
-            for segment in script_segments:
-                scene_number = segment.get("scene_number", 0)
-                scene_description = segment.get("description", "")
-                scene_narration = segment.get("narration", "")
-                characters = segment.get("characters", [])
-                setting = segment.get("setting", context.get("setting", ""))
-                scene_background = segment.get("scene_background", None)
-                emotions = segment.get("emotions", [])
-                
-                logger.info(f"Generating image for scene {scene_number} with {len(characters)} character(s)")
-                
-                # Generate scene image with complete character details
-                image_path = self.image_tool.generate_scene_image(
-                    scene_description=scene_description,
-                    scene_narration=scene_narration,
-                    characters=characters,
-                    setting=setting,
-                    emotions=emotions,
-                    scene_number=scene_number,
-                    character_references=character_references if character_references else None,
-                    scene_background=scene_background,
-                    style=art_style
+            character_references = self._build_character_references(script_segments, character_descriptions)
+            characters_summaries = self._batch_enrich_scenes(script_segments, character_references)
+            
+            scene_kwargs_list = [
+                self._scene_image_kwargs(segment, character_references, context, art_style, summary)
+                for segment, summary in zip(script_segments, characters_summaries)
+            ]
+            scene_images = [None] * len(script_segments)
+            
+            # Scenes with identical prompts share a single generation
+            unique, duplicates = self._dedupe_scenes(scene_kwargs_list)
+            
+            if unique and self.image_tool.supports_batch:
+                # Local pipelines render scenes in batched forward passes
+                unique_images = self.image_tool.generate_scene_images_batch(
+                    [scene_kwargs_list[index] for index in unique]
                 )
-                
-                scene_images.append(image_path)
+                for index, image_path in zip(unique, unique_images):
+                    scene_images[index] = image_path
+            # Generate scene images in parallel (each scene is independent)
+            elif unique:
+                max_workers = max(1, min(self.config.image_gen.max_concurrency, len(unique)))
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = {
+                        executor.submit(self._generate_scene, scene_kwargs_list[index]): index
+                        for index in unique
+                    }
+                    for future in as_completed(futures):
+                        scene_images[futures[future]] = future.result()
+            
+            for index, duplicate_indices in duplicates.items():
+                for duplicate_index in duplicate_indices:
+                    scene_images[duplicate_index] = self._copy_duplicate_scene(
+                        scene_images[index], scene_kwargs_list[duplicate_index]
+                    )
             
             logger.info(f"Generated {len([img for img in scene_images if img])} scene images")
             
@@ -313,6 +467,801 @@ Focus on consistency and child-friendly aesthetics."""
             logger.error(f"Error generating scene images: {e}")
             return []
     
+    async def agenerate_scene_images(
+        self,
+        script_segments: List[Dict[str, Any]],
+        character_descriptions: Dict[str, Dict[str, Any]],
+        context: Dict[str, Any],
+        art_style: Optional[str] = None
+    ) -> List[Optional[Path]]:
+        """
+        Async variant of generate_scene_images that gathers all scene images concurrently.
+        
+        Args:
+            script_segments: List of scene segments
+            character_descriptions: Character design descriptions
+            context: Context dictionary
+            art_style: Optional art style override
+            
+        Returns:
+            List of paths to generated scene images (in segment order)
+        """
+        try:
+            scene_images = [None] * len(script_segments)
+            async for index, image_path in self.iter_scene_images(
+                script_segments, character_descriptions, context, art_style
+            ):
+                scene_images[index] = image_path
+            
+            logger.info(f"Generated {len([img for img in scene_images if img])} scene images")
+            
+            return scene_images
+            
+        except Exception as e:
+            logger.error(f"Error generating scene images: {e}")
+            return []
+    
+    async def iter_scene_images(
+        self,
+        script_segments: List[Dict[str, Any]],
+        character_descriptions: Dict[str, Dict[str, Any]],
+        context: Dict[str, Any],
+        art_style: Optional[str] = None
+    ) -> AsyncIterator[Tuple[int, Optional[Path]]]:
+        """
+        Generate scene images concurrently, yielding each one as soon as it is ready.
+        
+        Results arrive in completion order, so downstream consumers (e.g. video assembly)
+        can start on finished scenes while the rest are still generating.
+        
+        Args:
+            script_segments: List of scene segments
+            character_descriptions: Character design descriptions
+            context: Context dictionary
+            art_style: Optional art style override
+            
+        Yields:
+            Tuples of (segment index in script_segments, image path or None)
+        """
+        logger.info(f"Generating images for {len(script_segments)} scenes (async)")
+        
+        if art_style is None:
+            art_style = self.config.image_gen.style or "cartoon"
+        
+        character_references = await asyncio.to_thread(
+            self._build_character_references, script_segments, character_descriptions
+        )
+        characters_summaries = await asyncio.to_thread(
+            self._batch_enrich_scenes, script_segments, character_references
+        )
+        
+        scene_kwargs_list = [
+            self._scene_image_kwargs(segment, character_references, context, art_style, summary)
+            for segment, summary in zip(script_segments, characters_summaries)
+        ]
+        
+        # Scenes with identical prompts share a single generation
+        unique, duplicates = self._dedupe_scenes(scene_kwargs_list)
+        
+        async def await_scene(index: int, job_id: str) -> Tuple[int, Optional[Path]]:
+            return index, await self.image_tool.await_job(job_id)
+        
+        job_ids = []
+        tasks = []
+        try:
+            # Submit every scene first, then wait on the jobs; workers are never tied up
+            # by the caller and concurrency is bounded by the image tool's job pool
+            for index in unique:
+                scene_kwargs = scene_kwargs_list[index]
+                logger.info(f"Submitting image job for scene {scene_kwargs['scene_number']} with {len(scene_kwargs['characters'])} character(s)")
+                await self.image_rate_limiter.aacquire()
+                job_ids.append(self.image_tool.submit_scene_image_job(**scene_kwargs))
+            
+            tasks = [
+                asyncio.ensure_future(await_scene(index, job_id))
+                for index, job_id in zip(unique, job_ids)
+            ]
+            
+            for next_done in asyncio.as_completed(tasks):
+                index, image_path = await next_done
+                yield index, image_path
+                for duplicate_index in duplicates.get(index, []):
+                    yield duplicate_index, self._copy_duplicate_scene(image_path, scene_kwargs_list[duplicate_index])
+        finally:
+            # Cancel outstanding scenes if submission is interrupted or the consumer stops early
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            # Drop jobs no waiter picked up, so they do not linger in the tool's job table
+            for job_id in job_ids:
+                self.image_tool.cancel_job(job_id)
+    
+    async def _adesign_with_descriptions(
+        self,
+        characters: List[Dict[str, Any]],
+        art_style: str,
+        age_group: str,
+        llm_descriptions: Dict[str, str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Generate reference images and build character designs from resolved descriptions.
+        
+        Args:
+            characters: List of character dictionaries
+            art_style: Art style
+            age_group: Target age group
+            llm_descriptions: LLM-generated descriptions keyed by character name
+            
+        Returns:
+            Dictionary mapping character names to design descriptions
+        """
+        character_descriptions = {}
+        
+        # Reuse indexed references and design repeated characters only once
+        results, pending, duplicates = self._partition_indexed_characters(characters, art_style, age_group)
+        
+        if pending and self.image_tool.supports_batch:
+            # Local pipelines render all reference sheets in batched forward passes
+            # (vision analysis is not available for these providers)
+            design_prompts = [
+                self._resolve_design_prompt(characters[index], art_style, age_group, llm_descriptions)
+                for index in pending
+            ]
+            reference_paths = await asyncio.to_thread(
+                self.image_tool.generate_character_references_batch,
+                [
+                    {
+                        "name": characters[index].get("name", "Unknown"),
+                        "description": design_prompt,
+                        "traits": characters[index].get("traits", [])
+                    }
+                    for index, design_prompt in zip(pending, design_prompts)
+                ],
+                style=art_style
+            )
+            for index, design_prompt, reference_path in zip(pending, design_prompts, reference_paths):
+                results[index] = self._build_character_entry(characters[index], design_prompt, reference_path, None)
+        elif pending:
+            # Reference generation and vision analysis overlap across characters
+            designed = await self._adesign_pipeline(
+                [characters[index] for index in pending], art_style, age_group, llm_descriptions
+            )
+            results.update(zip(pending, designed))
+        
+        self._finalize_indexed_characters(characters, art_style, age_group, results, pending, duplicates)
+        
+        # Preserve the input character order in the returned mapping
+        for index in sorted(results):
+            character_entry = results[index]
+            character_descriptions[character_entry["name"]] = character_entry
+        
+        logger.info(f"Character designs created for {len(character_descriptions)} characters")
+        
+        return character_descriptions
+    
+    def _character_identity_key(self, char: Dict[str, Any], art_style: str, age_group: str) -> str:
+        """Identity key for the reference index: name, type, sorted traits, style and age group."""
+        return stable_hash({
+            "name": char.get("name", "Unknown"),
+            "type": char.get("type", "unknown"),
+            "traits": sorted(char.get("traits", [])),
+            "style": art_style,
+            "age": age_group,
+        })
+    
+    def _partition_indexed_characters(
+        self,
+        characters: List[Dict[str, Any]],
+        art_style: str,
+        age_group: str
+    ) -> Tuple[Dict[int, Dict[str, Any]], List[int], Dict[int, int]]:
+        """
+        Split characters into indexed hits, characters to design, and in-video duplicates.
+        
+        Args:
+            characters: List of character dictionaries
+            art_style: Art style
+            age_group: Target age group
+            
+        Returns:
+            Tuple of (entries for index hits by position, positions to design,
+            duplicate position -> first position with the same identity)
+        """
+        results = {}
+        pending = []
+        duplicates = {}
+        first_by_key = {}
+        
+        for index, char in enumerate(characters):
+            key = self._character_identity_key(char, art_style, age_group)
+            if key in first_by_key:
+                duplicates[index] = first_by_key[key]
+                continue
+            first_by_key[key] = index
+            
+            indexed = self.reference_index.get(key)
+            # Copy the indexed image into this workflow, so its output folder stays self-contained
+            reference_path = indexed and self.image_tool.copy_character_reference(
+                Path(indexed["reference_image_path"]), char.get("name", "Unknown")
+            )
+            if reference_path:
+                logger.info(f"Reusing indexed reference image for {char.get('name', 'Unknown')}")
+                results[index] = self._build_character_entry(
+                    char,
+                    indexed["design_prompt"],
+                    reference_path,
+                    indexed.get("visual_analysis")
+                )
+            else:
+                pending.append(index)
+        
+        return results, pending, duplicates
+    
+    def _finalize_indexed_characters(
+        self,
+        characters: List[Dict[str, Any]],
+        art_style: str,
+        age_group: str,
+        results: Dict[int, Dict[str, Any]],
+        pending: List[int],
+        duplicates: Dict[int, int]
+    ):
+        """
+        Index newly generated references and fill in duplicate characters (updates results in place).
+        
+        Args:
+            characters: List of character dictionaries
+            art_style: Art style
+            age_group: Target age group
+            results: Entries by position
+            pending: Positions that were designed in this run
+            duplicates: Duplicate position -> first position with the same identity
+        """
+        for index in pending:
+            entry = results.get(index)
+            if entry and entry.get("reference_image_path"):
+                self.reference_index.put(
+                    self._character_identity_key(characters[index], art_style, age_group),
+                    {
+                        "design_prompt": entry["design_prompt"],
+                        "reference_image_path": entry["reference_image_path"],
+                        "visual_analysis": entry.get("visual_analysis"),
+                    }
+                )
+        
+        for index, first_index in duplicates.items():
+            if first_index in results:
+                results[index] = dict(results[first_index])
+    
+    def _build_design_messages(
+        self,
+        characters: List[Dict[str, Any]],
+        context: Dict[str, Any],
+        art_style: str,
+        age_group: str
+    ) -> List[Dict[str, str]]:
+        """
+        Build the chat messages for the character design LLM call.
+        
+        Args:
+            characters: List of character dictionaries
+            context: Context dictionary
+            art_style: Art style
+            age_group: Target age group
+            
+        Returns:
+            OpenAI-format chat messages (static system prompt first)
+        """
+        # Format characters for LLM input
+        characters_str = "\n".join([
+            f"- {char.get('name', 'Unknown')}: {char.get('type', 'character')} with traits: {', '.join(char.get('traits', []))}"
+            for char in characters
+        ])
+        
+        # Format context for LLM
+        context_str = f"Theme: {context.get('theme', 'N/A')}\nSetting: {context.get('setting', 'N/A')}\nMoral Lesson: {context.get('moral_lesson', 'N/A')}"
+        
+        # Format prompt with input
+        human_text = self.human_prompt.format(
+            characters=characters_str,
+            context=context_str,
+            art_style=art_style,
+            age_group=age_group
+        )
+        
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": human_text},
+        ]
+    
+    def _completion_params(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        """
+        Build chat completion request parameters.
+        
+        Args:
+            messages: OpenAI-format chat messages
+            
+        Returns:
+            Keyword arguments for chat.completions.create
+        """
+        llm_config = self.config.character_designer_llm
+        params = {
+            "model": llm_config.model,
+            "messages": messages,
+            "temperature": llm_config.temperature,
+            "max_tokens": llm_config.max_tokens,
+        }
+        
+        # prompt_cache_key is only sent when configured, since not every
+        # OpenAI-compatible endpoint accepts the parameter
+        if llm_config.prompt_cache_key:
+            params["extra_body"] = {"prompt_cache_key": llm_config.prompt_cache_key}
+        
+        return params
+    
+    def _retry_kwargs(self) -> Dict[str, Any]:
+        """Tenacity settings for transient LLM errors, from the retry config."""
+        retry_config = self.config.retry
+        return {
+            "wait": wait_exponential_jitter(
+                initial=retry_config.initial_backoff,
+                max=retry_config.max_backoff,
+                exp_base=retry_config.exponential_base
+            ),
+            "stop": stop_after_attempt(retry_config.max_retries + 1),
+            "retry": retry_if_exception_type(RETRYABLE_LLM_ERRORS),
+            "before_sleep": lambda state: logger.warning(
+                f"LLM call failed ({state.outcome.exception()}), retry {state.attempt_number}/{retry_config.max_retries}"
+            ),
+            "reraise": True,
+        }
+    
+    async def _acreate_completion(self, messages: List[Dict[str, str]]) -> Any:
+        """
+        Call chat completions, retrying rate limit and timeout errors with exponential backoff.
+        
+        Args:
+            messages: OpenAI-format chat messages
+            
+        Returns:
+            Chat completion response
+        """
+        async for attempt in AsyncRetrying(**self._retry_kwargs()):
+            with attempt:
+                await self.llm_rate_limiter.aacquire(self._estimate_request_tokens(messages))
+                return await self.async_client.chat.completions.create(**self._completion_params(messages))
+    
+    def _log_prompt_cache_usage(self, response: Any):
+        """Log how many prompt tokens were served from the provider's prompt cache."""
+        usage = getattr(response, "usage", None)
+        if not usage or not usage.prompt_tokens:
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", 0) or 0
+        logger.info(f"Prompt cache: {cached_tokens}/{usage.prompt_tokens} input tokens served from cache")
+    
+    def _estimate_request_tokens(self, messages: List[Dict[str, str]]) -> int:
+        """
+        Estimate the token cost of an LLM request for rate limiting.
+        
+        Args:
+            messages: Formatted chat messages
+            
+        Returns:
+            Estimated prompt tokens plus the completion token budget
+        """
+        return estimate_request_tokens(messages, self.config.character_designer_llm)
+    
+    def _llm_cache_key(
+        self,
+        characters: List[Dict[str, Any]],
+        context: Dict[str, Any],
+        art_style: str,
+        age_group: str
+    ) -> str:
+        """Compute the exact-match cache key for an LLM character design request."""
+        llm_config = self.config.character_designer_llm
+        return stable_hash({
+            "chars": characters,
+            "ctx": context,
+            "style": art_style,
+            "age": age_group,
+            "model": llm_config.model,
+            "temperature": llm_config.temperature,
+            "prompt": self.system_prompt + self.human_prompt,
+        })
+    
+    async def _agenerate_llm_descriptions(
+        self,
+        characters: List[Dict[str, Any]],
+        context: Dict[str, Any],
+        art_style: str,
+        age_group: str
+    ) -> Dict[str, str]:
+        """
+        Generate character design descriptions with the LLM.
+        
+        Args:
+            characters: List of character dictionaries
+            context: Context dictionary
+            art_style: Art style
+            age_group: Target age group
+            
+        Returns:
+            Dictionary mapping character names to design descriptions (empty on failure)
+        """
+        try:
+            cache_key = self._llm_cache_key(characters, context, art_style, age_group)
+            cached = load_cached(LLM_CACHE_NAMESPACE, cache_key)
+            if cached:
+                logger.info("Using cached LLM character designs")
+                return cached
+            
+            formatted_prompt = self._build_design_messages(characters, context, art_style, age_group)
+            
+            # Call LLM
+            logger.info("Generating character designs with LLM")
+            response = await self._acreate_completion(formatted_prompt)
+            self._log_prompt_cache_usage(response)
+            
+            # Parse LLM response to extract character descriptions
+            content = response.choices[0].message.content or ""
+            llm_descriptions = self._parse_llm_design_output(sanitize_text(content), characters)
+            if llm_descriptions:
+                save_cached(LLM_CACHE_NAMESPACE, cache_key, llm_descriptions)
+            
+            return llm_descriptions
+            
+        except Exception as e:
+            logger.warning(f"LLM character design generation failed: {e}. Using fallback method.")
+            return {}
+    
+    def _build_character_references(
+        self,
+        script_segments: List[Dict[str, Any]],
+        character_descriptions: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Build character reference details for all distinct characters in the segments.
+        
+        Args:
+            script_segments: List of scene segments
+            character_descriptions: Character design descriptions
+            
+        Returns:
+            Dictionary mapping character names to 'character_detail' and 'reference_image_path'
+        """
+        all_characters = set()
+        for segment in script_segments:
+            all_characters.update(segment.get("characters", []))
+        
+        logger.info(f"Building character references for {len(all_characters)} distinct character(s)")
+        
+        # The reference table only depends on the character designs, so it is kept across
+        # calls (e.g. regenerating a scene) and rebuilt only when the designs change
+        source_key = stable_hash(character_descriptions)
+        if source_key != self._char_ref_source_key:
+            self._char_ref_table = {}
+            self._char_ref_source_key = source_key
+        
+        missing = [
+            name for name in all_characters
+            if name in character_descriptions and name not in self._char_ref_table
+        ]
+        if missing:
+            self._char_ref_table.update(self._build_char_ref_entries(missing, character_descriptions))
+        
+        return {name: self._char_ref_table[name] for name in all_characters if name in self._char_ref_table}
+    
+    def _build_char_ref_entries(
+        self,
+        char_names: List[str],
+        character_descriptions: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Build reference table entries for the given characters.
+        
+        Args:
+            char_names: Names of characters present in character_descriptions
+            character_descriptions: Character design descriptions
+            
+        Returns:
+            Dictionary mapping character names to 'character_detail' and 'reference_image_path'
+        """
+        character_references = {}
+        for char_name in char_names:
+            char_desc = character_descriptions[char_name]
+            
+            # Build comprehensive character reference
+            char_type = char_desc.get("type", "character")
+            traits = char_desc.get("traits", [])
+            
+            # Prioritize visual analysis from reference image if available
+            visual_description = char_desc.get("visual_analysis") or char_desc.get("description") or ""
+            
+            # Get reference image path if available
+            reference_image_path = char_desc.get("reference_image_path")
+            
+            # Build comprehensive character description for character_detail
+            # Format: "Name (a type character with traits: trait1, trait2; visual details)"
+            char_desc_parts = [f"a {char_type}"]
+            
+            if traits:
+                traits_str = ", ".join(traits[:3])  # Limit to top 3 traits
+                char_desc_parts.append(f"with traits: {traits_str}")
+            
+            if visual_description:
+                char_desc_parts.append(visual_description)
+            
+            full_char_desc = " ".join(char_desc_parts)
+            character_detail = f"{char_name} ({full_char_desc})"
+            
+            # Create complete character reference dictionary
+            character_references[char_name] = {
+                "character_detail": character_detail,
+                "reference_image_path": reference_image_path,
+            }
+            
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Character %s: type=%s, traits=%s, has_visual_desc=%s, has_ref_image=%s",
+                    char_name, char_type, traits[:3], bool(visual_description), bool(reference_image_path)
+                )
+        
+        # Summarize every character_detail exceeding 800 characters in batched LLM calls
+        names = list(character_references)
+        details = [character_references[name]["character_detail"] for name in names]
+        if any(len(detail) > 800 for detail in details):
+            summarized = self.image_tool.summarize_character_descriptions_batch(details, max_length=800)
+            for name, detail in zip(names, summarized):
+                character_references[name]["character_detail"] = detail
+        
+        return character_references
+    
+    def _batch_enrich_scenes(
+        self,
+        script_segments: List[Dict[str, Any]],
+        character_references: Dict[str, Dict[str, Any]]
+    ) -> List[Optional[str]]:
+        """
+        Pre-summarize the character details of every scene with batched LLM calls.
+        
+        Scenes whose combined character details exceed the prompt budget are condensed
+        together (numbered, several per call) instead of one summarization call per scene.
+        
+        Args:
+            script_segments: List of scene segments
+            character_references: Character reference details keyed by name
+            
+        Returns:
+            Per-segment character summaries (None when the scene has no character references)
+        """
+        if not character_references:
+            return [None] * len(script_segments)
+        
+        scene_characters = [
+            self.image_tool.build_scene_characters_str(segment.get("characters", []), character_references)
+            for segment in script_segments
+        ]
+        summaries = self.image_tool.summarize_character_descriptions_batch(scene_characters, max_length=2000)
+        
+        return [
+            summary if segment.get("characters") else None
+            for segment, summary in zip(script_segments, summaries)
+        ]
+    
+    def _resolve_design_prompt(
+        self,
+        char: Dict[str, Any],
+        art_style: str,
+        age_group: str,
+        llm_descriptions: Dict[str, str]
+    ) -> str:
+        """Use the LLM-generated description if available, otherwise create a basic prompt."""
+        char_name = char.get("name", "Unknown")
+        if char_name in llm_descriptions:
+            return llm_descriptions[char_name]
+        return self._create_design_prompt(char, art_style, age_group)
+    
+    def _build_character_entry(
+        self,
+        char: Dict[str, Any],
+        design_prompt: str,
+        reference_image_path: Optional[Path],
+        visual_analysis: Optional[str]
+    ) -> Dict[str, Any]:
+        """Assemble the character design dictionary returned to the workflow."""
+        return {
+            "name": char.get("name", "Unknown"),
+            "type": char.get("type", "unknown"),
+            "traits": char.get("traits", []),
+            "description": design_prompt,
+            "design_prompt": design_prompt,
+            "visual_analysis": visual_analysis,  # Detailed description from GPT-4 Vision
+            "reference_image_path": str(reference_image_path) if reference_image_path else None,
+        }
+    
+    def _record_reference_result(self, reference_image_path: Optional[Path]):
+        """Feed a reference generation outcome to the circuit breaker (the tool returns None on failure)."""
+        if reference_image_path:
+            self.image_circuit_breaker.record_success()
+        else:
+            self.image_circuit_breaker.record_failure()
+    
+    async def _adesign_pipeline(
+        self,
+        characters: List[Dict[str, Any]],
+        art_style: str,
+        age_group: str,
+        llm_descriptions: Dict[str, str]
+    ) -> List[Dict[str, Any]]:
+        """
+        Design characters with a two-stage pipeline: reference generation feeds vision analysis.
+        
+        Stage A generates reference images and puts finished ones on a queue; stage B
+        analyzes them as they arrive, so character K is analyzed while character K+1's
+        image is still being generated and both endpoints stay busy.
+        
+        Args:
+            characters: List of character dictionaries
+            art_style: Art style
+            age_group: Target age group
+            llm_descriptions: LLM-generated descriptions keyed by character name
+            
+        Returns:
+            Character design dictionaries, in input order
+        """
+        if not characters:
+            return []
+        
+        concurrency = max(1, min(self.config.image_gen.max_concurrency, len(characters)))
+        design_prompts = [
+            self._resolve_design_prompt(char, art_style, age_group, llm_descriptions)
+            for char in characters
+        ]
+        reference_paths: List[Optional[Path]] = [None] * len(characters)
+        visual_analyses: List[Optional[str]] = [None] * len(characters)
+        failed = set()
+        
+        queue: asyncio.Queue = asyncio.Queue()
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def generate_reference(index: int):
+            char = characters[index]
+            char_name = char.get("name", "Unknown")
+            async with semaphore:
+                if not self.image_circuit_breaker.allow_request():
+                    logger.warning(f"Image provider circuit open, skipping reference image for {char_name}")
+                    return
+                logger.info(f"Generating reference image for {char_name}")
+                await self.image_rate_limiter.aacquire()
+                try:
+                    reference_paths[index] = await self.image_tool.agenerate_character_reference(
+                        character_name=char_name,
+                        character_description=design_prompts[index],
+                        traits=char.get("traits", []),
+                        style=art_style
+                    )
+                except Exception as e:
+                    logger.error(f"Error designing {char_name}: {e}")
+                    failed.add(index)
+                finally:
+                    self._record_reference_result(reference_paths[index])
+            if reference_paths[index]:
+                await queue.put(index)
+        
+        async def analyze_references():
+            while True:
+                index = await queue.get()
+                if index is None:
+                    return
+                char = characters[index]
+                await self.vision_rate_limiter.aacquire(VISION_ANALYSIS_TOKEN_ESTIMATE)
+                try:
+                    visual_analyses[index] = await self.image_tool.aanalyze_character_image(
+                        image_path=reference_paths[index],
+                        character_name=char.get("name", "Unknown"),
+                        character_type=char.get("type", "unknown")
+                    )
+                except Exception as e:
+                    logger.warning(f"Vision analysis failed for {char.get('name', 'Unknown')}: {e}")
+        
+        async def produce():
+            try:
+                await asyncio.gather(*[generate_reference(index) for index in range(len(characters))])
+            finally:
+                # One sentinel per consumer so every analyzer exits
+                for _ in range(concurrency):
+                    await queue.put(None)
+        
+        await asyncio.gather(produce(), *[analyze_references() for _ in range(concurrency)])
+        
+        return [
+            self._fallback_character_entry(char) if index in failed
+            else self._build_character_entry(char, design_prompt, reference_path, visual_analysis)
+            for index, (char, design_prompt, reference_path, visual_analysis)
+            in enumerate(zip(characters, design_prompts, reference_paths, visual_analyses))
+        ]
+    
+    def _scene_image_kwargs(
+        self,
+        segment: Dict[str, Any],
+        character_references: Dict[str, Dict[str, Any]],
+        context: Dict[str, Any],
+        art_style: str,
+        characters_summary: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Build the generate_scene_image keyword arguments for a scene segment."""
+        return {
+            "scene_description": segment.get("description", ""),
+            "scene_narration": segment.get("narration", ""),
+            "characters": segment.get("characters", []),
+            "setting": segment.get("setting", context.get("setting", "")),
+            "emotions": segment.get("emotions", []),
+            "scene_number": segment.get("scene_number", 0),
+            "character_references": character_references if character_references else None,
+            "scene_background": segment.get("scene_background", None),
+            "style": art_style,
+            "characters_summary": characters_summary,
+        }
+    
+    def _dedupe_scenes(self, scene_kwargs_list: List[Dict[str, Any]]) -> Tuple[List[int], Dict[int, List[int]]]:
+        """
+        Group scenes whose image prompts would be identical.
+        
+        Every prompt input except the scene number is hashed. The character reference
+        table is shared by all scenes of a call, so it is left out of the key.
+        
+        Args:
+            scene_kwargs_list: generate_scene_image keyword arguments, one per scene
+            
+        Returns:
+            Tuple of (indices to generate, first index -> indices of its duplicates)
+        """
+        unique = []
+        duplicates: Dict[int, List[int]] = {}
+        first_by_key = {}
+        
+        for index, scene_kwargs in enumerate(scene_kwargs_list):
+            prompt_inputs = {
+                key: value for key, value in scene_kwargs.items()
+                if key not in ("scene_number", "character_references")
+            }
+            key = hashlib.blake2b(stable_json_dumps(prompt_inputs), digest_size=16).hexdigest()
+            
+            if key in first_by_key:
+                duplicates.setdefault(first_by_key[key], []).append(index)
+            else:
+                first_by_key[key] = index
+                unique.append(index)
+        
+        if duplicates:
+            logger.info(f"Reusing images for {len(scene_kwargs_list) - len(unique)} scene(s) with duplicate prompts")
+        
+        return unique, duplicates
+    
+    def _copy_duplicate_scene(self, image_path: Optional[Path], scene_kwargs: Dict[str, Any]) -> Optional[Path]:
+        """Give a duplicate scene its own copy of the shared image."""
+        if not image_path:
+            return None
+        return self.image_tool.copy_scene_image(image_path, scene_kwargs["scene_number"])
+    
+    def _generate_scene(self, scene_kwargs: Dict[str, Any]) -> Optional[Path]:
+        """
+        Generate the image for a single scene.
+        
+        Args:
+            scene_kwargs: generate_scene_image keyword arguments from _scene_image_kwargs
+            
+        Returns:
+            Path to generated scene image, or None if generation failed
+        """
+        logger.info(f"Generating image for scene {scene_kwargs['scene_number']} with {len(scene_kwargs['characters'])} character(s)")
+        
+        # Generate scene image with complete character details
+        self.image_rate_limiter.acquire()
+        return self.image_tool.generate_scene_image(**scene_kwargs)
+    
     def _create_design_prompt(
         self,
         character: Dict[str, Any],
@@ -330,23 +1279,13 @@ Focus on consistency and child-friendly aesthetics."""
         Returns:
             Design prompt string
         """
-        name = character.get("name", "Unknown")
-        char_type = character.get("type", "unknown")
-        traits = character.get("traits", [])
-        
-        traits_str = ", ".join(traits) if traits else "friendly"
-        
-        prompt = (
-            f"{name}, a {char_type} character, "
-            f"with traits: {traits_str}, "
-            f"{art_style} style, "
-            f"bright and colorful, "
-            f"child-friendly design, "
-            f"appropriate for {age_group} age group, "
-            f"expressive and animated"
+        return build_design_prompt(
+            character.get("name", "Unknown"),
+            character.get("type", "unknown"),
+            tuple(character.get("traits", [])),
+            art_style,
+            age_group
         )
-        
-        return prompt
     
     def _fallback_character_descriptions(
         self,
@@ -365,28 +1304,41 @@ Focus on consistency and child-friendly aesthetics."""
         character_descriptions = {}
         
         for char in characters:
-            name = char.get("name", "Unknown")
-            char_type = char.get("type", "unknown")
-            traits = char.get("traits", [])
-            
-            character_descriptions[name] = {
-                "name": name,
-                "type": char_type,
-                "traits": traits,
-                "description": f"{name} is a {char_type} character with traits: {', '.join(traits) if traits else 'friendly'}",
-                "design_prompt": f"{name}, {char_type}, cartoon style, bright and colorful, child-friendly",
-                "reference_image_path": None,
-            }
+            entry = self._fallback_character_entry(char)
+            character_descriptions[entry["name"]] = entry
         
         return character_descriptions
+    
+    def _fallback_character_entry(self, char: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Create a basic description for a single character without LLM or images.
+        
+        Args:
+            char: Character dictionary
+            
+        Returns:
+            Basic character description
+        """
+        name = char.get("name", "Unknown")
+        char_type = char.get("type", "unknown")
+        traits = char.get("traits", [])
+        
+        return {
+            "name": name,
+            "type": char_type,
+            "traits": traits,
+            "description": f"{name} is a {char_type} character with traits: {', '.join(traits) if traits else 'friendly'}",
+            "design_prompt": f"{name}, {char_type}, cartoon style, bright and colorful, child-friendly",
+            "reference_image_path": None,
+        }
 
-    def _parse_llm_character_response(
+    def _parse_llm_design_output(
         self,
         llm_response: str,
         characters: List[Dict[str, Any]]
     ) -> Dict[str, str]:
         """
-        Parse LLM response to extract character design descriptions.
+        Parse the JSON array of character designs, falling back to the text parser.
         
         Args:
             llm_response: Raw LLM response text
@@ -395,8 +1347,48 @@ Focus on consistency and child-friendly aesthetics."""
         Returns:
             Dictionary mapping character names to design descriptions
         """
-        import re
+        try:
+            # Tolerate code fences or prose around the JSON payload
+            designs = fast_json_loads(extract_json_text(llm_response))
+            
+            if isinstance(designs, dict):
+                designs = [designs]
+            
+            # Map returned names back to the requested character names (case-insensitive)
+            requested_names = {char.get("name", "Unknown").lower(): char.get("name", "Unknown") for char in characters}
+            
+            character_designs = {}
+            for design in designs:
+                name = str(design.get("name", "")).strip().strip("*[]").strip()
+                description = " ".join(str(design.get("description", "")).split())
+                if name.lower() in requested_names and description:
+                    character_designs[requested_names[name.lower()]] = description
+            
+            if character_designs:
+                return character_designs
+            
+            logger.warning("JSON character designs did not match any requested characters")
+            
+        except (ValueError, TypeError, AttributeError) as e:
+            logger.warning(f"Could not parse JSON character designs ({e}), falling back to text parsing")
+        
+        return self._parse_llm_character_response(llm_response, characters)
+    
+    def _parse_llm_character_response(
+        self,
+        llm_response: str,
+        characters: List[Dict[str, Any]]
+    ) -> Dict[str, str]:
+        """
+        Parse free-form LLM text to extract character design descriptions.
         
+        Args:
+            llm_response: Raw LLM response text
+            characters: List of character dictionaries
+            
+        Returns:
+            Dictionary mapping character names to design descriptions
+        """
         character_designs = {}
         
         try:
@@ -406,20 +1398,11 @@ Focus on consistency and child-friendly aesthetics."""
                 char_name = char.get("name", "Unknown")
                 
                 # Look for patterns like "CharacterName:" or "- CharacterName:" followed by description
-                patterns = [
-                    rf"\*\*{char_name}\*\*[:\-]?\s*(.+?)(?=\n\*\*|$)",  # **Name**: description
-                    rf"#{1,3}\s*{char_name}[:\-]?\s*(.+?)(?=\n#|\n\n|$)",  # # Name: description
-                    rf"{char_name}[:\-]\s*(.+?)(?=\n\n|\n[A-Z]|$)",  # Name: description
-                ]
-                
-                for pattern in patterns:
-                    match = re.search(pattern, llm_response, re.DOTALL | re.IGNORECASE)
+                for pattern in compile_character_patterns(char_name):
+                    match = pattern.search(llm_response)
                     if match:
-                        description = match.group(1).strip()
-                        # Clean up the description
-                        description = re.sub(r'\n+', ' ', description)  # Replace newlines with spaces
-                        description = re.sub(r'\s+', ' ', description)  # Normalize whitespace
-                        character_designs[char_name] = description
+                        # Clean up the description (collapse newlines and whitespace runs)
+                        character_designs[char_name] = " ".join(match.group(1).split())
                         break
             
             # If we didn't find structured descriptions, try to extract from general text
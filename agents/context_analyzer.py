@@ -1,20 +1,23 @@
 """Context Analyzer Agent for parsing and validating input context."""
 
 import logging
-import json
 from typing import Dict, Any, List, Optional
 
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate, SystemMessagePromptTemplate, HumanMessagePromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 
 from config import get_config
+from utils.llm_client import get_llm
 from utils.validators import validate_input
-from utils.helpers import sanitize_text
+from utils.helpers import sanitize_text, stable_json_dumps, extract_json_text
+from utils.cache import stable_hash, load_cached, save_cached
+from utils.rate_limiter import get_llm_rate_limiter, estimate_request_tokens
 
 logger = logging.getLogger(__name__)
 
+# Cache namespace for analyzed contexts
+CONTEXT_CACHE_NAMESPACE = "context_llm_cache"
+
 
 class ValidatedContext(BaseModel):
     """Validated context structure."""
@@ -37,13 +40,8 @@ class ContextAnalyzerAgent:
     def __init__(self):
         """Initialize context analyzer agent."""
         self.config = get_config()
-        self.llm = ChatOpenAI(
-            model_name=self.config.llm.model,
-            temperature=self.config.llm.temperature,
-            max_tokens=self.config.llm.max_tokens,
-            api_key=self.config.llm.api_key,
-            base_url=self.config.llm.base_url
-        )
+        self.llm = get_llm(self.config.llm)
+        self.llm_rate_limiter = get_llm_rate_limiter(self.config.llm)
         self.output_parser = PydanticOutputParser(pydantic_object=ValidatedContext)
         
         # System prompt for context analysis
@@ -71,6 +69,10 @@ Input Context:
 {format_instructions}
 
 Provide validated context with search queries for knowledge enrichment."""
+        
+        # System message and format instructions are static, so build them once
+        self._system_message = {"role": "system", "content": self.system_prompt}
+        self._format_instructions = self.output_parser.get_format_instructions()
 
     def analyze(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -85,78 +87,161 @@ Provide validated context with search queries for knowledge enrichment."""
         Raises:
             ValueError: If input validation fails
         """
-        # First validate input structure
-        is_valid, error_message = validate_input(input_data)
-        if not is_valid:
-            raise ValueError(f"Input validation failed: {error_message}")
+        context = self._validate_input(input_data)
         
-        context = input_data.get("context", {})
+        cache_key = self._cache_key(context)
+        cached = load_cached(CONTEXT_CACHE_NAMESPACE, cache_key)
+        if cached:
+            logger.info("Using cached context analysis")
+            return cached
         
         try:
             logger.info("Analyzing input context")
             
-            # Create prompt
-            prompt = ChatPromptTemplate.from_messages([
-                SystemMessagePromptTemplate.from_template(self.system_prompt),
-                HumanMessagePromptTemplate.from_template(self.human_prompt)
-            ])
-            
-            # Format prompt with input
-            formatted_prompt = prompt.format_messages(
-                input_context=json.dumps(context, indent=2),
-                format_instructions=self.output_parser.get_format_instructions()
-            )
-            
             # Call LLM
-            response = self.llm.invoke(formatted_prompt)
+            messages = self._format_prompt(context)
+            self.llm_rate_limiter.acquire(estimate_request_tokens(messages, self.config.llm))
+            response = self.llm.invoke(messages)
             
-            # Parse response
-            validated_context = self.output_parser.parse(response.content)
+            result = self._parse_response(response.content)
+            save_cached(CONTEXT_CACHE_NAMESPACE, cache_key, result)
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error analyzing context: {e}")
+            return self._fallback_context(context)
+    
+    async def aanalyze(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async variant of analyze, so callers can overlap analysis with other LLM work.
+        
+        Args:
+            input_data: Input dictionary with 'context' and 'preferences' keys
             
-            # Convert to dictionary
-            result = {
-                "topic": validated_context.topic,
-                "theme": validated_context.theme,
-                "characters": validated_context.characters,
-                "setting": validated_context.setting,
-                "moral_lesson": validated_context.moral_lesson,
-                "age_group": validated_context.age_group,
-                "duration_minutes": validated_context.duration_minutes,
-                "search_queries": validated_context.search_queries,
-            }
+        Returns:
+            Dictionary with validated context and search queries
             
-            # Add optional fields if available
-            if validated_context.story_tale:
-                result["story_tale"] = validated_context.story_tale
-            if validated_context.plot:
-                result["plot"] = validated_context.plot
+        Raises:
+            ValueError: If input validation fails
+        """
+        context = self._validate_input(input_data)
+        
+        cache_key = self._cache_key(context)
+        cached = load_cached(CONTEXT_CACHE_NAMESPACE, cache_key)
+        if cached:
+            logger.info("Using cached context analysis")
+            return cached
+        
+        try:
+            logger.info("Analyzing input context (async)")
             
-            logger.info(f"Context analyzed successfully. Generated {len(result['search_queries'])} search queries")
+            messages = self._format_prompt(context)
+            await self.llm_rate_limiter.aacquire(estimate_request_tokens(messages, self.config.llm))
+            response = await self.llm.ainvoke(messages)
             
+            result = self._parse_response(response.content)
+            save_cached(CONTEXT_CACHE_NAMESPACE, cache_key, result)
             return result
             
         except Exception as e:
             logger.error(f"Error analyzing context: {e}")
-            # Fallback: return basic validated context without LLM
-            logger.warning("Falling back to basic validation")
-            fallback_result = {
-                "topic": context.get("topic", ""),
-                "theme": context.get("theme", ""),
-                "characters": context.get("characters", []),
-                "setting": context.get("setting", ""),
-                "moral_lesson": context.get("moral_lesson", ""),
-                "age_group": context.get("age_group", "6-8"),
-                "duration_minutes": context.get("duration_minutes", 3),
-                "search_queries": self._generate_fallback_queries(context),
-            }
+            return self._fallback_context(context)
+    
+    def _validate_input(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate the input structure and return its context.
+        
+        Args:
+            input_data: Input dictionary with 'context' and 'preferences' keys
+            
+        Returns:
+            Input context dictionary
             
-            # Add optional fields if available
-            if context.get("story_tale"):
-                fallback_result["story_tale"] = context.get("story_tale")
-            if context.get("plot"):
-                fallback_result["plot"] = context.get("plot")
+        Raises:
+            ValueError: If input validation fails
+        """
+        is_valid, error_message = validate_input(input_data)
+        if not is_valid:
+            raise ValueError(f"Input validation failed: {error_message}")
+        
+        return input_data.get("context", {})
+    
+    def _cache_key(self, context: Dict[str, Any]) -> str:
+        """Compute the exact-match cache key for analyzing an input context."""
+        return stable_hash({
+            "ctx": context,
+            "model": self.config.llm.model,
+            "temperature": self.config.llm.temperature,
+            "prompt": self.system_prompt + self.human_prompt,
+        })
+    
+    def _format_prompt(self, context: Dict[str, Any]) -> List[Any]:
+        """Format the analysis prompt messages for an input context."""
+        human_message = self.human_prompt.format(
+            # Compact, key-sorted JSON: indentation only adds prompt tokens
+            input_context=stable_json_dumps(context).decode("utf-8"),
+            format_instructions=self._format_instructions
+        )
+        return [self._system_message, {"role": "user", "content": human_message}]
+    
+    def _parse_response(self, content: str) -> Dict[str, Any]:
+        """
+        Parse the LLM response into a validated context dictionary.
+        
+        Args:
+            content: Raw LLM response text
+            
+        Returns:
+            Dictionary with validated context and search queries
+        """
+        try:
+            # Validate straight from the JSON text in one pydantic-core pass
+            validated_context = ValidatedContext.model_validate_json(extract_json_text(content))
+        except ValidationError as e:
+            logger.debug(f"Direct JSON validation failed, retrying with output parser: {e}")
+            validated_context = self.output_parser.parse(content)
+        
+        # Convert to dictionary
+        result = validated_context.model_dump(mode="python")
+        
+        # Keep optional fields only if available
+        for optional_field in ("story_tale", "plot"):
+            if not result[optional_field]:
+                del result[optional_field]
+        
+        logger.info(f"Context analyzed successfully. Generated {len(result['search_queries'])} search queries")
+        
+        return result
+    
+    def _fallback_context(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build a basic validated context without the LLM.
+        
+        Args:
+            context: Input context
             
-            return fallback_result
+        Returns:
+            Dictionary with basic validated context and search queries
+        """
+        logger.warning("Falling back to basic validation")
+        fallback_result = {
+            "topic": context.get("topic", ""),
+            "theme": context.get("theme", ""),
+            "characters": context.get("characters", []),
+            "setting": context.get("setting", ""),
+            "moral_lesson": context.get("moral_lesson", ""),
+            "age_group": context.get("age_group", "6-8"),
+            "duration_minutes": context.get("duration_minutes", 3),
+            "search_queries": self._generate_fallback_queries(context),
+        }
+        
+        # Add optional fields if available
+        if context.get("story_tale"):
+            fallback_result["story_tale"] = context.get("story_tale")
+        if context.get("plot"):
+            fallback_result["plot"] = context.get("plot")
+        
+        return fallback_result
     
     def _generate_fallback_queries(self, context: Dict[str, Any]) -> List[str]:
         """
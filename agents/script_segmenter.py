@@ -1,19 +1,119 @@
 """Script Segmentation Agent for breaking story into visual scenes."""
 
+import re
+import copy
+import asyncio
 import logging
-import json
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from difflib import SequenceMatcher
+from typing import Dict, Any, List, Optional, Iterator, AsyncIterator, Tuple, Callable, FrozenSet, Sequence
 
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate, SystemMessagePromptTemplate, HumanMessagePromptTemplate
+from langchain_core.exceptions import OutputParserException
 from langchain_core.output_parsers import PydanticOutputParser
-from pydantic import BaseModel, Field
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import BaseModel, Field, ValidationError, TypeAdapter
+
+try:
+    from rapidfuzz import fuzz
+except ImportError:
+    fuzz = None
 
 from config import get_config
-from utils.helpers import sanitize_text
+from utils.llm_client import get_llm, get_async_llm, async_llm_session
+from utils.helpers import format_characters_and_setting, extract_json_text, fast_json_loads
+from utils.cache import stable_hash, load_cached, save_cached
+from utils.rate_limiter import get_llm_rate_limiter, estimate_request_tokens
 
 logger = logging.getLogger(__name__)
 
+# Word tokenizer for story coverage checks (punctuation is not part of a word)
+WORD_PATTERN = re.compile(r"\w+")
+
+# Paragraph breaks, tolerating whitespace on the blank line
+PARAGRAPH_BREAK_PATTERN = re.compile(r"\n\s*\n")
+
+# Words per shingle when measuring verbatim story coverage
+SHINGLE_SIZE = 5
+
+# Minimum word-sequence similarity between the story and the combined narrations
+STORY_SIMILARITY_THRESHOLD = 0.85
+
+# Cache namespace for segmented stories
+SEGMENT_CACHE_NAMESPACE = "segment_llm_cache"
+
+# Stories longer than this are parsed and coverage-checked off the event loop
+THREAD_OFFLOAD_STORY_CHARS = 100_000
+
+
+def tokenize_words(text: str) -> List[str]:
+    """Case-folded words of a text, in order, extracted in C without a per-word Python loop."""
+    return WORD_PATTERN.findall(text.casefold())
+
+
+def word_shingles(tokens: Sequence[str]) -> FrozenSet[int]:
+    """
+    Hashed runs of SHINGLE_SIZE consecutive words (the whole sequence if it is shorter).
+    
+    Unlike a set of single words, shingles only match where the word order matches,
+    and storing their hashes keeps the set small.
+    
+    Args:
+        tokens: Token sequence
+        
+    Returns:
+        Set of shingle hashes
+    """
+    size = min(SHINGLE_SIZE, len(tokens))
+    if not size:
+        return frozenset()
+    return frozenset(map(hash, zip(*(tokens[offset:] for offset in range(size)))))
+
+
+@lru_cache(maxsize=8)
+def story_word_index(story: str) -> Tuple[Tuple[str, ...], FrozenSet[int]]:
+    """
+    Tokenize a story once for coverage checks.
+    
+    Cached, so speculative variants, fallback retries and duplicate batch items
+    checking the same story share a single tokenization.
+    
+    Args:
+        story: Story text
+        
+    Returns:
+        Tuple of (story words in order, story word shingles)
+    """
+    tokens = tuple(tokenize_words(story))
+    return tokens, word_shingles(tokens)
+
+
+def sequence_similarity(first: Sequence[str], second: Sequence[str], cutoff: float = 0.0) -> float:
+    """
+    Order-sensitive similarity of two token sequences.
+    
+    Uses rapidfuzz when installed, otherwise difflib. Pairs that cannot reach the
+    cutoff are rejected early, without computing the exact alignment.
+    
+    Args:
+        first: First token sequence
+        second: Second token sequence
+        cutoff: Minimum similarity of interest
+        
+    Returns:
+        Similarity between 0.0 and 1.0; any value below cutoff only means "below cutoff"
+    """
+    if fuzz is not None:
+        return fuzz.ratio(first, second, score_cutoff=cutoff * 100) / 100.0
+    
+    matcher = SequenceMatcher(None, first, second, autojunk=False)
+    if cutoff:
+        # Cheap upper bounds: length ratio, then shared-token multiset ratio
+        for upper_bound in (matcher.real_quick_ratio, matcher.quick_ratio):
+            bound = upper_bound()
+            if bound < cutoff:
+                return bound
+    return matcher.ratio()
+
 
 class SceneSegment(BaseModel):
     """Scene segment structure."""
@@ -36,19 +136,137 @@ class ScriptSegments(BaseModel):
     segments: List[SceneSegment] = Field(description="List of scene segments")
 
 
+# Validate straight from JSON / raw dicts; the models above are the only copy of the schema
+SEGMENT_ADAPTER = TypeAdapter(SceneSegment)
+SEGMENTS_ADAPTER = TypeAdapter(ScriptSegments)
+
+# Strict OpenAI structured-output schema for ScriptSegments (every field required, dialogue nullable)
+_SEGMENTS_FUNCTION = convert_to_openai_tool(ScriptSegments, strict=True)["function"]
+# The prompt asks for 12-15 scenes; with structured outputs the decoder enforces it too
+_SEGMENTS_FUNCTION["parameters"]["properties"]["segments"].update(minItems=12, maxItems=15)
+SEGMENTS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": _SEGMENTS_FUNCTION["name"],
+        "description": _SEGMENTS_FUNCTION["description"],
+        "schema": _SEGMENTS_FUNCTION["parameters"],
+        "strict": True,
+    },
+}
+
+# Replaces the output parser's format instructions when the schema is enforced by the provider
+STRUCTURED_OUTPUT_INSTRUCTIONS = "Respond with a JSON object matching the ScriptSegments response schema."
+
+
+class SegmentStreamParser:
+    """
+    Incrementally extract completed scene segment objects from a streamed JSON response.
+    
+    Tracks brace depth (ignoring braces inside strings) and parses each object at
+    depth 2 -- an element of the "segments" array -- as soon as it closes.
+    """
+    
+    def __init__(self):
+        """Initialize an empty parser."""
+        self._chunks: List[str] = []
+        self._pending = ""
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._object_start: Optional[int] = None
+        self._closed_objects = 0
+        self.segments: List[Dict[str, Any]] = []
+        self.skipped = 0
+    
+    @property
+    def text(self) -> str:
+        """Full response text received so far."""
+        return "".join(self._chunks)
+    
+    @property
+    def complete_segments(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        All segment objects, if the response was a complete JSON document and every
+        segment in it parsed; None otherwise (the full text must then be parsed).
+        """
+        if self._closed_objects == 0 or self._depth != 0 or self.skipped or not self.segments:
+            return None
+        return self.segments
+    
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """
+        Consume a streamed chunk.
+        
+        Args:
+            chunk: Next piece of response text
+            
+        Returns:
+            Segment objects completed by this chunk (may be empty)
+        """
+        self._chunks.append(chunk)
+        
+        # Only the text of the segment currently being received is kept in _pending
+        offset = len(self._pending)
+        self._pending += chunk
+        completed = []
+        
+        for index in range(offset, len(self._pending)):
+            char = self._pending[index]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+                if self._depth == 2:
+                    self._object_start = index
+            elif char == "}":
+                if self._depth == 2 and self._object_start is not None:
+                    try:
+                        completed.append(fast_json_loads(self._pending[self._object_start:index + 1]))
+                    except ValueError as e:
+                        self.skipped += 1
+                        logger.debug(f"Skipping unparseable streamed segment: {e}")
+                    self._object_start = None
+                elif self._depth == 1:
+                    self._closed_objects += 1
+                self._depth -= 1
+        
+        # Drop text that can no longer be part of a segment object
+        if self._object_start is None:
+            self._pending = ""
+        else:
+            self._pending = self._pending[self._object_start:]
+            self._object_start = 0
+        
+        self.segments.extend(completed)
+        return completed
+
+
 class ScriptSegmentationAgent:
     """Agent for breaking story into visual scene segments."""
     
     def __init__(self):
         """Initialize script segmentation agent."""
         self.config = get_config()
-        self.llm = ChatOpenAI(
-            model_name=self.config.script_segmenter_llm.model,
-            temperature=self.config.script_segmenter_llm.temperature,
-            max_tokens=self.config.script_segmenter_llm.max_tokens,
-            api_key=self.config.script_segmenter_llm.api_key,
-            base_url=self.config.script_segmenter_llm.base_url
-        )
+        self.llm = get_llm(self.config.script_segmenter_llm)
+        self.llm_rate_limiter = get_llm_rate_limiter(self.config.script_segmenter_llm)
+        
+        # prompt_cache_key is only sent when configured, since not every
+        # OpenAI-compatible endpoint accepts the parameter
+        prompt_cache_key = self.config.script_segmenter_llm.prompt_cache_key
+        self._llm_kwargs = {"extra_body": {"prompt_cache_key": prompt_cache_key}} if prompt_cache_key else {}
+        
+        # With structured outputs the provider enforces the schema while decoding, so
+        # the long JSON-schema format instructions can be left out of the prompt
+        self.structured_output = self.config.script_segmenter_llm.structured_output
+        if self.structured_output:
+            self._llm_kwargs["response_format"] = SEGMENTS_RESPONSE_FORMAT
         self.output_parser = PydanticOutputParser(pydantic_object=ScriptSegments)
         
         # System prompt for script segmentation
@@ -100,36 +318,9 @@ Your role is to break a story into EXACTLY 12-15 visual scene segments where:
 6. Each scene has clear visual elements (characters, setting, actions)
 7. Visual descriptions should match the narration content
 8. Each scene includes character emotions and expressions
-9. The total video duration matches the target (approximately 3-5 minutes)
+9. The total video duration matches the Target Duration given with the story
 10. CRITICAL: Each segment description (except the first) MUST include visual context from the previous segment for continuity
 
-⚠️ SEGMENT COUNT RESTRICTION ⚠️
-YOU MUST CREATE BETWEEN 12 AND 15 SEGMENTS ONLY.
-Creating 16 or more segments is UNACCEPTABLE and will be rejected.
-Creating fewer than 12 segments is also UNACCEPTABLE.
-If the story is long, distribute the text across 12-15 segments evenly.
-DO NOT exceed 15 segments under any circumstances.
-
-CRITICAL STORY COVERAGE REQUIREMENTS (READ CAREFULLY):
-❌ DO NOT summarize the story - copy the exact text
-❌ DO NOT paraphrase sentences - use the original wording
-❌ DO NOT skip paragraphs or sentences - include everything
-❌ DO NOT stop before reaching the end - segment the ENTIRE story
-✅ DO copy each sentence from the story exactly as written
-✅ DO start with the very first word of the story
-✅ DO end with the very last word of the story
-✅ DO verify that concatenating all narrations = complete original story
-✅ DO create EXACTLY 12-15 segments (never more than 15, never fewer than 12)
-
-VERIFICATION CHECKLIST BEFORE SUBMITTING:
-1. Did I include the first sentence of the story in segment 1's narration? ✓
-2. Did I include the last sentence of the story in the final segment's narration? ✓
-3. Are there any sentences from the story that I skipped? (Answer must be NO)
-4. Did I paraphrase or summarize any part? (Answer must be NO)
-5. If I concatenate all segment narrations, does it equal the full story? (Answer must be YES)
-6. Did I create between 12 and 15 segments? (Answer must be YES - count your segments!)
-7. Is my segment count 15 or fewer? (Answer must be YES - exceeding 15 is FORBIDDEN)
-
 REQUIRED FIELDS FOR EVERY SEGMENT (INCLUDING THE LAST ONE):
 You MUST provide ALL of the following fields for EVERY segment without exception:
 1. scene_number - Sequential number (1, 2, 3, etc.)
@@ -142,20 +333,6 @@ You MUST provide ALL of the following fields for EVERY segment without exception
 8. scene_background - Detailed 2-3 sentence description with lighting, atmosphere, time of day, weather, environmental details, and visual mood
 9. emotions - List of emotions to convey (at least one emotion, e.g., ["joy"], ["tension", "fear"])
 
-CRITICAL CHARACTER LISTING REQUIREMENTS:
-The "characters" field MUST include ALL characters that appear in ANY of these fields for that segment:
-- Characters mentioned in the description
-- Characters speaking in the dialogue
-- Characters mentioned in the narration
-- Characters performing actions in the scene
-
-Example: If the narration says "Leo found a feather and showed it to Mia", then characters MUST be ["Leo", "Mia"]
-Example: If the dialogue is "'Look!' said Leo to Mia and Sam", then characters MUST be ["Leo", "Mia", "Sam"]
-Example: If only the description mentions "Leo alone in the forest", then characters should be ["Leo"]
-
-DO NOT omit characters even if they only appear briefly or are just mentioned in passing.
-The characters list should be comprehensive and include every character name that appears in the segment.
-
 ⚠️ CRITICAL CHARACTER IDENTIFICATION RULES ⚠️
 
 A character MUST be a NAMED INDIVIDUAL (a specific person, animal, or creature with a name or title).
@@ -268,29 +445,6 @@ Ensure visual continuity between scenes (characters maintain consistent appearan
 
         self.human_prompt = """Break the following story into EXACTLY 12-15 visual scene segments (MINIMUM 12, MAXIMUM 15):
 
-⚠️⚠️⚠️ MANDATORY FIRST STEP: ANALYZE THE STORY ⚠️⚠️⚠️
-
-BEFORE YOU CREATE ANY SEGMENTS, COMPLETE THIS ANALYSIS:
-
-1. READ the entire story below from beginning to end
-2. IDENTIFY all important characters that appear in the story
-3. UNDERSTAND when and where each character appears
-4. NOTE key events, objects, locations, and story progression
-5. VERIFY character names against the Context section
-6. PLAN your segmentation based on natural story breaks
-
-Only AFTER completing this analysis should you create segments.
-
-Your segments must have PRECISE descriptions that accurately reflect the story content.
-
-Story:
-{story}
-
-Context:
-{context}
-
-Target Duration: {duration_minutes} minutes
-
 {format_instructions}
 
 ⚠️⚠️⚠️ CRITICAL INSTRUCTIONS - READ BEFORE STARTING ⚠️⚠️⚠️
@@ -324,18 +478,6 @@ WHAT YOU MUST NOT DO:
 ❌ DO NOT create more than 15 segments - this is absolutely forbidden
 ❌ DO NOT create fewer than 12 segments - this is also forbidden
 
-REQUIRED FIELDS - ALL 9 FIELDS MUST BE PRESENT IN EVERY SEGMENT:
-Every segment MUST include all of these fields:
-- scene_number (integer)
-- description (string) - CRITICAL: For segment 1, provide detailed opening scene based on story. For segments 2-15, start with 1-2 brief phrases referencing previous 1-2 segments, then provide PRECISE description of current segment's actual characters, actions, and events from the story (80% current, 20% previous)
-- characters (list of strings) - MUST include ALL characters mentioned in description, dialogue, OR narration
-- dialogue (string or null)
-- narration (string, VERBATIM from story, never empty, never summarized)
-- duration_seconds (float, 4.0-8.0)
-- setting (string, 1-2 words)
-- scene_background (string, 2-3 detailed sentences)
-- emotions (list of strings, at least one)
-
 ⚠️⚠️⚠️ CRITICAL - CHARACTER LISTING RULES ⚠️⚠️⚠️
 
 When populating the "characters" field, you MUST follow these rules STRICTLY:
@@ -431,7 +573,38 @@ If you cannot answer YES to all of the above, DO NOT SUBMIT. Go back and fix it.
 
 CRITICAL REMINDER: The LAST segment (segment 15-20) MUST have ALL 9 fields just like the first segment. Do not omit duration_seconds, setting, scene_background, or emotions from the final segment.
 
-Now segment the story above following these requirements."""
+Now segment the story in the next message following these requirements."""
+
+        # Per-request values go last, after the static instructions above, so every
+        # request shares a byte-identical prefix that providers can prompt-cache
+        self.story_prompt = """Story:
+{story}
+
+Context:
+{context}
+
+Target Duration: {duration_minutes} minutes"""
+
+        # Sent alone when a response cannot be parsed, so fixing it does not re-send the full prompt
+        self.repair_prompt = """Your previous response could not be parsed as the required JSON.
+
+Error: {error}
+
+Previous response:
+{response}
+
+{format_instructions}
+
+Return only the corrected JSON object. Keep all narration text exactly as it is; fix only the JSON structure and missing or mistyped fields."""
+        
+        # The system and instruction messages are static, so render them once; the target
+        # duration is only stated in the trailing story message, keeping the whole prefix
+        # identical across durations for provider prompt caching
+        self._system_message = {"role": "system", "content": self.system_prompt}
+        self._format_instructions = (
+            STRUCTURED_OUTPUT_INSTRUCTIONS if self.structured_output else self.output_parser.get_format_instructions()
+        )
+        self._instruction_message = {"role": "user", "content": self.human_prompt.format(format_instructions=self._format_instructions)}
 
     def segment(
         self,
@@ -450,61 +623,34 @@ Now segment the story above following these requirements."""
         Returns:
             List of scene segment dictionaries
         """
+        if target_duration_minutes is None:
+            target_duration_minutes = context.get("duration_minutes", 3)
+        
+        # Formatted once, for both the cache key and the prompt
+        context_text = self._format_context(context)
+        
+        cache_key = self._cache_key(story, context_text, target_duration_minutes)
+        cached = load_cached(SEGMENT_CACHE_NAMESPACE, cache_key)
+        if cached:
+            logger.info("Using cached story segmentation")
+            return cached
+        
         try:
             logger.info("Segmenting story into visual scenes")
             
-            if target_duration_minutes is None:
-                target_duration_minutes = context.get("duration_minutes", 3)
-            
-            # Format context for prompt
-            context_text = self._format_context(context)
-            
-            # Create prompt
-            prompt = ChatPromptTemplate.from_messages([
-                SystemMessagePromptTemplate.from_template(self.system_prompt),
-                HumanMessagePromptTemplate.from_template(self.human_prompt)
-            ])
-            
-            formatted_prompt = prompt.format_messages(
-                story=story,
-                context=context_text,
-                duration_minutes=target_duration_minutes,
-                format_instructions=self.output_parser.get_format_instructions()
-            )
-            
-            # Call LLM
-            response = self.llm.invoke(formatted_prompt)
-            
-            # Parse response
-            parsed = self.output_parser.parse(response.content)
-            
-            # Convert to list of dictionaries
-            segments = []
-            for segment in parsed.segments:
-                segments.append({
-                    "scene_number": segment.scene_number,
-                    "description": segment.description,
-                    "characters": segment.characters,
-                    "dialogue": segment.dialogue,
-                    "narration": segment.narration,
-                    "duration_seconds": segment.duration_seconds,
-                    "setting": segment.setting,
-                    "scene_background": segment.scene_background,
-                    "emotions": segment.emotions,
-                })
-            
-            # Validate story coverage
-            if not self._validate_story_coverage(segments, story):
-                logger.warning("Story coverage validation failed, attempting fallback")
-                # Try fallback segmentation if validation fails
-                segments = self._fallback_segmentation(story, context, target_duration_minutes)
-            
-            # Validate and adjust durations
-            segments = self._validate_durations(segments, target_duration_minutes)
-            
-            logger.info(f"Story segmented into {len(segments)} scenes")
+            # Stream the LLM response so segments are parsed while generation continues
+            parser = SegmentStreamParser()
+            for _ in self._stream_segments(self._format_prompt(story, context_text, target_duration_minutes), parser):
+                pass
             
-            return segments
+            try:
+                return self._process_response(parser.text, story, context, target_duration_minutes, cache_key, parser.complete_segments)
+            except OutputParserException as e:
+                logger.warning(f"Segmentation response could not be parsed, requesting a repair: {e.__cause__ or e}")
+                repair_prompt = self._format_repair_prompt(parser.text, e)
+                self.llm_rate_limiter.acquire(self._estimate_request_tokens(repair_prompt))
+                response = self.llm.invoke(repair_prompt, **self._llm_kwargs)
+                return self._process_response(response.content, story, context, target_duration_minutes, cache_key)
             
         except Exception as e:
             logger.error(f"Error segmenting story: {e}")
@@ -512,35 +658,546 @@ Now segment the story above following these requirements."""
             logger.warning("Falling back to simple segmentation")
             return self._fallback_segmentation(story, context, target_duration_minutes)
     
-    def _format_context(self, context: Dict[str, Any]) -> str:
+    async def asegment(
+        self,
+        story: str,
+        context: Dict[str, Any],
+        target_duration_minutes: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
         """
-        Format context for prompt.
+        Async variant of segment, so callers can overlap segmentation with other LLM work.
         
         Args:
+            story: Generated story text
+            context: Context dictionary with characters, setting, etc.
+            target_duration_minutes: Target video duration in minutes
+            
+        Returns:
+            List of scene segment dictionaries
+        """
+        if target_duration_minutes is None:
+            target_duration_minutes = context.get("duration_minutes", 3)
+        
+        # Formatted once, for both the cache key and the prompt
+        context_text = self._format_context(context)
+        
+        cache_key = self._cache_key(story, context_text, target_duration_minutes)
+        cached = load_cached(SEGMENT_CACHE_NAMESPACE, cache_key)
+        if cached:
+            logger.info("Using cached story segmentation")
+            return cached
+        
+        async with async_llm_session():
+            try:
+                logger.info("Segmenting story into visual scenes (async)")
+                
+                formatted_prompt = self._format_prompt(story, context_text, target_duration_minutes)
+                
+                temperatures = self.config.script_segmenter_llm.speculative_temperatures
+                if temperatures:
+                    segments = await self._aspeculative_segments(formatted_prompt, story, temperatures)
+                    if segments is None:
+                        logger.warning("No speculative variant passed story coverage, attempting fallback")
+                        segments = self._fallback_segmentation(story, context, target_duration_minutes)
+                        cache_key = None
+                    segments = self._validate_durations(segments, target_duration_minutes)
+                    if cache_key:
+                        save_cached(SEGMENT_CACHE_NAMESPACE, cache_key, segments)
+                    logger.info(f"Story segmented into {len(segments)} scenes")
+                    return segments
+                
+                parser = SegmentStreamParser()
+                received = 0
+                llm = get_async_llm(self.config.script_segmenter_llm)
+                await self.llm_rate_limiter.aacquire(self._estimate_request_tokens(formatted_prompt))
+                async for chunk in llm.astream(formatted_prompt, **self._llm_kwargs):
+                    received += len(parser.feed(chunk.content))
+                    self._log_prompt_cache_usage(chunk)
+                logger.info(f"Received {received} streamed segments")
+                
+                try:
+                    return await self._arun_story_work(
+                        story, self._process_response,
+                        parser.text, story, context, target_duration_minutes, cache_key, parser.complete_segments
+                    )
+                except OutputParserException as e:
+                    logger.warning(f"Segmentation response could not be parsed, requesting a repair: {e.__cause__ or e}")
+                    repair_prompt = self._format_repair_prompt(parser.text, e)
+                    await self.llm_rate_limiter.aacquire(self._estimate_request_tokens(repair_prompt))
+                    response = await llm.ainvoke(repair_prompt, **self._llm_kwargs)
+                    return await self._arun_story_work(
+                        story, self._process_response,
+                        response.content, story, context, target_duration_minutes, cache_key
+                    )
+                
+            except Exception as e:
+                logger.error(f"Error segmenting story: {e}")
+                logger.warning("Falling back to simple segmentation")
+                return self._fallback_segmentation(story, context, target_duration_minutes)
+    
+    async def _aspeculative_segments(
+        self,
+        formatted_prompt: List[Any],
+        story: str,
+        temperatures: List[float]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Request several segmentation variants concurrently and keep the first good one.
+        
+        Args:
+            formatted_prompt: Formatted prompt messages
+            story: Original story text
+            temperatures: One sampling temperature per variant
+            
+        Returns:
+            Segments of the first variant that passes story coverage, or None if none do
+        """
+        llm_config = self.config.script_segmenter_llm
+        request_tokens = self._estimate_request_tokens(formatted_prompt)
+        
+        async def request_variant(temperature: float) -> Any:
+            await self.llm_rate_limiter.aacquire(request_tokens)
+            return await get_async_llm(llm_config, temperature=temperature).ainvoke(formatted_prompt, **self._llm_kwargs)
+        
+        tasks = [asyncio.create_task(request_variant(temperature)) for temperature in temperatures]
+        logger.info(f"Requesting {len(tasks)} speculative segmentation variants")
+        
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    response = await next_done
+                    self._log_prompt_cache_usage(response)
+                    segments = await self._arun_story_work(story, self._covered_segments, response.content, story)
+                except Exception as e:
+                    logger.warning(f"Speculative segmentation variant failed: {e}")
+                    continue
+                
+                if segments is not None:
+                    return segments
+            return None
+        finally:
+            # Stop paying for variants that are no longer needed
+            for task in tasks:
+                task.cancel()
+    
+    async def _arun_story_work(self, story: str, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run CPU-bound parsing/validation for a story, off the event loop if the story is large.
+        
+        Args:
+            story: Story being segmented (its length decides where the work runs)
+            func: Function to call
+            *args: Arguments for func
+            
+        Returns:
+            Result of func
+        """
+        if len(story) > THREAD_OFFLOAD_STORY_CHARS:
+            return await asyncio.to_thread(func, *args)
+        return func(*args)
+    
+    async def asegment_batch(
+        self,
+        items: List[Tuple[Any, ...]],
+        target_duration_minutes: Optional[int] = None,
+        max_concurrency: Optional[int] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Segment many stories (e.g. the chapters of a book) concurrently.
+        
+        Identical requests in the batch are segmented once and share the result.
+        
+        Args:
+            items: List of (story, context) or (story, context, target_duration_minutes) tuples
+            target_duration_minutes: Target video duration in minutes for items without their own
+            max_concurrency: Maximum parallel requests (defaults to the configured limit)
+            
+        Returns:
+            Scene segment lists, in the same order as items
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.config.script_segmenter_llm.max_concurrency)
+        
+        async def segment_one(story: str, context: Dict[str, Any], duration: Optional[int]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self.asegment(story, context, duration)
+        
+        # Group identical requests so concurrent duplicates do not all miss the cache
+        requests, item_keys = self._group_batch_items(items, target_duration_minutes)
+        
+        logger.info(f"Segmenting {len(items)} stories ({len(requests)} unique)")
+        # One session scope for the whole batch, so stories queued on the semaphore reuse its connections
+        async with async_llm_session():
+            results = await asyncio.gather(*(segment_one(story, context, duration) for story, context, duration in requests.values()))
+        return self._ungroup_batch_results(dict(zip(requests, results)), item_keys)
+    
+    def segment_batched(
+        self,
+        items: List[Tuple[Any, ...]],
+        target_duration_minutes: Optional[int] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Segment many stories, running the LLM calls through the OpenAI Batch API.
+        
+        Intended for offline runs where per-story latency does not matter: every uncached
+        segmentation prompt is submitted as one discounted batch job, and each response then
+        goes through the usual parsing, coverage and duration checks.
+        
+        Args:
+            items: List of (story, context) or (story, context, target_duration_minutes) tuples
+            target_duration_minutes: Target video duration in minutes for items without their own
+            
+        Returns:
+            Scene segment lists, in the same order as items
+        """
+        from tools.batch_tool import OpenAIBatchTool
+        
+        requests, item_keys = self._group_batch_items(items, target_duration_minutes)
+        
+        # Collect segmentation prompts not already answered by the response cache
+        by_key = {}
+        batch_requests = {}
+        for index, (key, (story, context, duration)) in enumerate(requests.items()):
+            cached = load_cached(SEGMENT_CACHE_NAMESPACE, key)
+            if cached:
+                by_key[key] = cached
+                continue
+            batch_requests[f"story-{index}"] = self._format_prompt(story, self._format_context(context), duration)
+        
+        responses = {}
+        if batch_requests:
+            llm_config = self.config.script_segmenter_llm
+            # Batch request bodies take prompt_cache_key and response_format as top-level fields
+            extra_body = dict(self._llm_kwargs.get("extra_body", {}))
+            if "response_format" in self._llm_kwargs:
+                extra_body["response_format"] = self._llm_kwargs["response_format"]
+            try:
+                logger.info(f"Submitting {len(batch_requests)} segmentation prompt(s) to the Batch API")
+                responses = OpenAIBatchTool(api_key=llm_config.api_key, base_url=llm_config.base_url).run_chat_batch(
+                    batch_requests,
+                    model=llm_config.model,
+                    temperature=llm_config.temperature,
+                    max_tokens=llm_config.max_tokens,
+                    extra_body=extra_body
+                )
+            except Exception as e:
+                logger.warning(f"Batch segmentation failed: {e}. Using fallback segmentation.")
+        
+        for index, (key, (story, context, duration)) in enumerate(requests.items()):
+            if key in by_key:
+                continue
+            content = responses.get(f"story-{index}")
+            if content is None:
+                logger.warning("No batch response for story, falling back to simple segmentation")
+                by_key[key] = self._fallback_segmentation(story, context, duration)
+                continue
+            try:
+                by_key[key] = self._process_response(content, story, context, duration, key)
+            except Exception as e:
+                logger.error(f"Error segmenting story: {e}")
+                logger.warning("Falling back to simple segmentation")
+                by_key[key] = self._fallback_segmentation(story, context, duration)
+        
+        return self._ungroup_batch_results(by_key, item_keys)
+    
+    def _group_batch_items(
+        self,
+        items: List[Tuple[Any, ...]],
+        target_duration_minutes: Optional[int]
+    ) -> Tuple[Dict[str, Tuple[str, Dict[str, Any], int]], List[str]]:
+        """
+        Resolve each batch item's duration and group identical requests by cache key.
+        
+        Args:
+            items: List of (story, context) or (story, context, target_duration_minutes) tuples
+            target_duration_minutes: Target video duration in minutes for items without their own
+            
+        Returns:
+            Tuple of (unique (story, context, duration) requests by cache key, cache key of each item)
+        """
+        requests: Dict[str, Tuple[str, Dict[str, Any], int]] = {}
+        item_keys = []
+        for story, context, *duration in items:
+            duration = duration[0] if duration else target_duration_minutes
+            if duration is None:
+                duration = context.get("duration_minutes", 3)
+            key = self._cache_key(story, self._format_context(context), duration)
+            requests.setdefault(key, (story, context, duration))
+            item_keys.append(key)
+        return requests, item_keys
+    
+    @staticmethod
+    def _ungroup_batch_results(
+        by_key: Dict[str, List[Dict[str, Any]]],
+        item_keys: List[str]
+    ) -> List[List[Dict[str, Any]]]:
+        """Expand results for unique requests back to one segment list per batch item."""
+        # Duplicates get their own copies, since segments are edited downstream
+        outputs = []
+        seen = set()
+        for key in item_keys:
+            outputs.append(copy.deepcopy(by_key[key]) if key in seen else by_key[key])
+            seen.add(key)
+        return outputs
+    
+    def iter_segments(
+        self,
+        story: str,
+        context: Dict[str, Any],
+        target_duration_minutes: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream segmentation, yielding each scene as soon as its JSON object is complete.
+        
+        Lets downstream work (e.g. scene image generation) start before the whole
+        script has been generated. Yielded segments are schema-validated but not yet
+        coverage- or duration-checked; use segment() for the final validated script.
+        
+        Args:
+            story: Generated story text
+            context: Context dictionary with characters, setting, etc.
+            target_duration_minutes: Target video duration in minutes
+            
+        Yields:
+            Scene segment dictionaries, in generation order
+        """
+        if target_duration_minutes is None:
+            target_duration_minutes = context.get("duration_minutes", 3)
+        
+        formatted_prompt = self._format_prompt(story, self._format_context(context), target_duration_minutes)
+        for raw_segment in self._stream_segments(formatted_prompt, SegmentStreamParser()):
+            try:
+                yield self._validate_segment(raw_segment)
+            except ValueError as e:
+                logger.warning(f"Skipping invalid streamed segment: {e}")
+    
+    async def aiter_segments(
+        self,
+        story: str,
+        context: Dict[str, Any],
+        target_duration_minutes: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Async variant of iter_segments, for consumers that start per-scene work on an event loop.
+        
+        Yielded segments are schema-validated but not yet coverage- or duration-checked;
+        use asegment() for the final validated script.
+        
+        Args:
+            story: Generated story text
+            context: Context dictionary with characters, setting, etc.
+            target_duration_minutes: Target video duration in minutes
+            
+        Yields:
+            Scene segment dictionaries, in generation order
+        """
+        if target_duration_minutes is None:
+            target_duration_minutes = context.get("duration_minutes", 3)
+        
+        formatted_prompt = self._format_prompt(story, self._format_context(context), target_duration_minutes)
+        parser = SegmentStreamParser()
+        received = 0
+        await self.llm_rate_limiter.aacquire(self._estimate_request_tokens(formatted_prompt))
+        async with async_llm_session():
+            async for chunk in get_async_llm(self.config.script_segmenter_llm).astream(formatted_prompt, **self._llm_kwargs):
+                for raw_segment in parser.feed(chunk.content):
+                    received += 1
+                    try:
+                        yield self._validate_segment(raw_segment)
+                    except ValueError as e:
+                        logger.warning(f"Skipping invalid streamed segment: {e}")
+                self._log_prompt_cache_usage(chunk)
+        logger.info(f"Received {received} streamed segments")
+    
+    def _stream_segments(self, formatted_prompt: List[Any], parser: SegmentStreamParser) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the LLM response through a parser.
+        
+        Args:
+            formatted_prompt: Formatted prompt messages
+            parser: Parser accumulating the response text
+            
+        Yields:
+            Raw segment objects as they complete
+        """
+        received = 0
+        self.llm_rate_limiter.acquire(self._estimate_request_tokens(formatted_prompt))
+        for chunk in self.llm.stream(formatted_prompt, **self._llm_kwargs):
+            for raw_segment in parser.feed(chunk.content):
+                received += 1
+                logger.debug(f"Received segment {received} from stream")
+                yield raw_segment
+            self._log_prompt_cache_usage(chunk)
+        logger.info(f"Received {received} streamed segments")
+    
+    def _estimate_request_tokens(self, formatted_prompt: List[Dict[str, Any]]) -> int:
+        """Estimate the token cost of a segmentation request for rate limiting."""
+        return estimate_request_tokens(formatted_prompt, self.config.script_segmenter_llm)
+    
+    def _log_prompt_cache_usage(self, message: Any):
+        """Log how many prompt tokens were served from the provider's prompt cache."""
+        usage = getattr(message, "usage_metadata", None)
+        if not usage or not usage.get("input_tokens"):
+            return
+        cached_tokens = usage.get("input_token_details", {}).get("cache_read", 0) or 0
+        logger.info(f"Prompt cache: {cached_tokens}/{usage['input_tokens']} input tokens served from cache")
+    
+    def _cache_key(self, story: str, context_text: str, target_duration_minutes: int) -> str:
+        """Compute the exact-match cache key for segmenting a story with its formatted context."""
+        llm_config = self.config.script_segmenter_llm
+        return stable_hash({
+            "story": story,
+            "context": context_text,
+            "duration": target_duration_minutes,
+            "model": llm_config.model,
+            "temperature": llm_config.temperature,
+            "prompt": self.system_prompt + self.human_prompt + self.story_prompt,
+        })
+    
+    def _format_prompt(
+        self,
+        story: str,
+        context_text: str,
+        target_duration_minutes: int
+    ) -> List[Any]:
+        """Format the segmentation prompt messages for a story and its formatted context."""
+        story_message = self.story_prompt.format(
+            story=story,
+            context=context_text,
+            duration_minutes=target_duration_minutes
+        )
+        return [self._system_message, self._instruction_message, {"role": "user", "content": story_message}]
+    
+    def _format_repair_prompt(self, content: str, error: Exception) -> List[Any]:
+        """Format a short request asking the LLM to fix an unparseable segmentation response."""
+        repair_message = self.repair_prompt.format(
+            # The parser's own message repeats the whole response; its cause is the concise error
+            error=error.__cause__ or error,
+            response=content,
+            format_instructions=self._format_instructions
+        )
+        return [{"role": "user", "content": repair_message}]
+    
+    def _process_response(
+        self,
+        content: str,
+        story: str,
+        context: Dict[str, Any],
+        target_duration_minutes: int,
+        cache_key: Optional[str] = None,
+        streamed_segments: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Parse the LLM response into validated scene segments.
+        
+        Args:
+            content: Raw LLM response text
+            story: Original story text
             context: Context dictionary
+            target_duration_minutes: Target duration in minutes
+            cache_key: Optional cache key to store segments that pass story coverage under
+            streamed_segments: Optional raw segment objects already decoded while streaming
             
         Returns:
-            Formatted context string
+            List of scene segment dictionaries
         """
-        parts = []
+        segments = self._covered_segments(content, story, streamed_segments)
         
-        # Characters
-        characters = context.get("characters", [])
-        if characters:
-            parts.append("Characters:")
-            for char in characters:
-                name = char.get("name", "Unknown")
-                char_type = char.get("type", "unknown")
-                traits = char.get("traits", [])
-                traits_str = ", ".join(traits) if traits else "none"
-                parts.append(f"  - {name} ({char_type}): {traits_str}")
+        if segments is None:
+            logger.warning("Story coverage validation failed, attempting fallback")
+            # Try fallback segmentation if validation fails
+            segments = self._fallback_segmentation(story, context, target_duration_minutes)
+            # Only LLM segmentations are cached; fallbacks are retried on the next run
+            cache_key = None
         
-        # Setting
-        setting = context.get("setting", "")
-        if setting:
-            parts.append(f"\nSetting: {setting}")
+        # Validate and adjust durations
+        segments = self._validate_durations(segments, target_duration_minutes)
+        
+        if cache_key:
+            save_cached(SEGMENT_CACHE_NAMESPACE, cache_key, segments)
+        
+        logger.info(f"Story segmented into {len(segments)} scenes")
+        
+        return segments
+    
+    def _covered_segments(
+        self,
+        content: str,
+        story: str,
+        streamed_segments: Optional[List[Dict[str, Any]]] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Parse an LLM response and check that its narrations cover the story.
+        
+        Args:
+            content: Raw LLM response text
+            story: Original story text
+            streamed_segments: Optional raw segment objects already decoded while streaming
+            
+        Returns:
+            List of scene segment dictionaries, or None if story coverage is inadequate
+        """
+        segments = None
+        if streamed_segments:
+            # Reuse the objects decoded during streaming instead of re-parsing the response
+            try:
+                segments = [self._validate_segment(raw_segment) for raw_segment in streamed_segments]
+            except ValueError as e:
+                logger.debug(f"Streamed segments failed validation, parsing full response: {e}")
+        if segments is None:
+            segments = self._parse_segments(content)
+        
+        # Validate story coverage
+        if not self._validate_story_coverage(segments, story):
+            return None
+        return segments
+    
+    def _parse_segments(self, content: str) -> List[Dict[str, Any]]:
+        """
+        Parse and validate the segmentation response.
+        
+        Validates straight from the JSON text in one pydantic-core pass, falling back to
+        the more lenient LangChain parser for malformed responses.
+        
+        Args:
+            content: Raw LLM response text
+            
+        Returns:
+            List of validated scene segment dictionaries
+        """
+        try:
+            script = SEGMENTS_ADAPTER.validate_json(extract_json_text(content))
+        except ValidationError as e:
+            logger.debug(f"Direct JSON validation failed, retrying with output parser: {e}")
+            script = self.output_parser.parse(content)
+        
+        return SEGMENTS_ADAPTER.dump_python(script)["segments"]
+    
+    def _validate_segment(self, raw_segment: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate one raw scene object into the dictionary used by the workflow.
+        
+        Args:
+            raw_segment: Scene object decoded from the response
+            
+        Returns:
+            Validated scene segment dictionary
+            
+        Raises:
+            ValueError: If the scene does not match the segment schema
+        """
+        return SEGMENT_ADAPTER.dump_python(SEGMENT_ADAPTER.validate_python(raw_segment))
+    
+    def _format_context(self, context: Dict[str, Any]) -> str:
+        """
+        Format context for prompt.
         
-        return "\n".join(parts)
+        Args:
+            context: Context dictionary
+            
+        Returns:
+            Formatted context string
+        """
+        return format_characters_and_setting(context)
     
     def _validate_durations(
         self,
@@ -559,8 +1216,9 @@ Now segment the story above following these requirements."""
         """
         target_duration_seconds = target_duration_minutes * 60
         
-        # Calculate total duration
-        total_duration = sum(seg.get("duration_seconds", 5.0) for seg in segments)
+        # Calculate total duration, keeping each duration for the rescaling pass
+        durations = [seg.get("duration_seconds", 5.0) for seg in segments]
+        total_duration = sum(durations)
         
         # If total is close to target, return as is
         if abs(total_duration - target_duration_seconds) < 10:
@@ -569,15 +1227,11 @@ Now segment the story above following these requirements."""
         # Adjust durations proportionally
         scale_factor = target_duration_seconds / total_duration if total_duration > 0 else 1.0
         
-        adjusted = []
-        for seg in segments:
-            new_duration = seg.get("duration_seconds", 5.0) * scale_factor
+        for seg, duration in zip(segments, durations):
             # Clamp to 4-8 seconds
-            new_duration = max(4.0, min(8.0, new_duration))
-            seg["duration_seconds"] = new_duration
-            adjusted.append(seg)
+            seg["duration_seconds"] = max(4.0, min(8.0, duration * scale_factor))
         
-        return adjusted
+        return segments
     
     def _validate_story_coverage(
         self,
@@ -595,51 +1249,56 @@ Now segment the story above following these requirements."""
             True if story coverage is adequate, False otherwise
         """
         try:
-            # Concatenate all narrations
-            combined_narration = " ".join(
-                seg.get("narration", "") for seg in segments
-            )
+            narrations = [seg.get("narration", "") for seg in segments]
             
-            if not combined_narration.strip():
+            if not any(narration.strip() for narration in narrations):
                 logger.warning("No narration found in segments")
                 return False
             
-            # Calculate word coverage (allow some flexibility for minor edits)
-            story_words = set(original_story.lower().split())
-            narration_words = set(combined_narration.lower().split())
+            # Tokenize narrations one by one, without building a combined string
+            story_tokens, story_shingles = story_word_index(original_story)
+            narration_tokens = []
+            for narration in narrations:
+                narration_tokens.extend(tokenize_words(narration))
             
-            if len(story_words) == 0:
+            if not story_tokens:
                 return False
             
-            coverage = len(story_words & narration_words) / len(story_words)
+            # The order-sensitive similarity is what catches summarized or skipped passages
+            similarity = sequence_similarity(story_tokens, narration_tokens, STORY_SIMILARITY_THRESHOLD)
+            passed_similarity = similarity >= STORY_SIMILARITY_THRESHOLD
+            
+            # Verbatim coverage is only reported, so it is computed only when it will be
+            # logged. Missing runs follow from the intersection size.
+            if not passed_similarity or logger.isEnabledFor(logging.INFO):
+                covered_count = len(story_shingles & word_shingles(narration_tokens))
+                missing_count = len(story_shingles) - covered_count
+                coverage = covered_count / len(story_shingles)
             
             # Calculate character-level similarity to detect paraphrasing
             story_chars = len(original_story)
-            narration_chars = len(combined_narration)
+            narration_chars = sum(len(narration) for narration in narrations)
             char_ratio = narration_chars / story_chars if story_chars > 0 else 0
             
             # Log detailed coverage information
-            logger.info(f"Story coverage: {coverage:.1%} ({len(narration_words)} words in narration vs {len(story_words)} in story)")
-            logger.info(f"Character count: {narration_chars} in narration vs {story_chars} in story (ratio: {char_ratio:.1%})")
-            logger.info(f"Number of segments: {len(segments)}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Story coverage: %.1f%% (%d of %d story word runs in narration)", coverage * 100, covered_count, len(story_shingles))
+                logger.info("Story similarity: %.1f%% (%d narration tokens vs %d story tokens)", similarity * 100, len(narration_tokens), len(story_tokens))
+                logger.info("Character count: %d in narration vs %d in story (ratio: %.1f%%)", narration_chars, story_chars, char_ratio * 100)
+                logger.info("Number of segments: %d", len(segments))
             
             # Show first and last narration snippets for debugging
-            if segments:
-                first_narration = segments[0].get("narration", "")[:100]
-                last_narration = segments[-1].get("narration", "")[-100:]  # Last 100 chars
-                first_story = original_story[:100]
-                last_story = original_story[-100:]
-                
-                logger.info(f"First segment narration: {first_narration}...")
-                logger.info(f"First story text:        {first_story}...")
-                logger.info(f"Last segment narration:  ...{last_narration}")
-                logger.info(f"Last story text:         ...{last_story}")
-            
-            # Require at least 85% word coverage
-            if coverage < 0.85:
-                logger.warning(f"Story coverage only {coverage:.1%}, below 85% threshold")
+            if segments and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("First segment narration: %s...", segments[0].get("narration", "")[:100])
+                logger.debug("First story text:        %s...", original_story[:100])
+                logger.debug("Last segment narration:  ...%s", segments[-1].get("narration", "")[-100:])
+                logger.debug("Last story text:         ...%s", original_story[-100:])
+            
+            # Require the narrations to reproduce the story's word sequence closely
+            if not passed_similarity:
+                logger.warning(f"Story similarity only {similarity:.1%}, below {STORY_SIMILARITY_THRESHOLD:.0%} threshold")
                 logger.warning("LLM may have truncated or summarized the story instead of using exact text")
-                logger.warning(f"Missing {len(story_words - narration_words)} unique words from original story")
+                logger.warning(f"Missing {missing_count} of {len(story_shingles)} {SHINGLE_SIZE}-word runs from original story")
                 return False
             
             # Check that combined narration is substantial (should be close to original length)
@@ -648,7 +1307,8 @@ Now segment the story above following these requirements."""
                 logger.warning("LLM likely summarized instead of copying verbatim")
                 return False
             
-            logger.info(f"✓ Story coverage validation passed: {coverage:.1%} word coverage, {char_ratio:.1%} character ratio")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"✓ Story coverage validation passed: {similarity:.1%} similarity, {coverage:.1%} verbatim coverage, {char_ratio:.1%} character ratio")
             return True
             
         except Exception as e:
@@ -673,32 +1333,45 @@ Now segment the story above following these requirements."""
             List of basic scene segments
         """
         # Split story into paragraphs
-        paragraphs = [p.strip() for p in story.split("\n\n") if p.strip()]
+        paragraphs = [p for p in map(str.strip, PARAGRAPH_BREAK_PATTERN.split(story)) if p]
         
-        # Create segments from paragraphs
-        segments = []
-        characters = [char.get("name", "") for char in context.get("characters", [])]
+        # First 2 characters appear in every fallback scene
+        characters = [char.get("name", "") for char in context.get("characters", [])[:2]]
         setting = context.get("setting", "")
         
         num_segments = min(len(paragraphs), 10)  # Max 10 segments
         duration_per_segment = (target_duration_minutes * 60) / num_segments
         duration_per_segment = max(4.0, min(8.0, duration_per_segment))
         
-        for i, paragraph in enumerate(paragraphs[:num_segments], 1):
-            # Create a basic scene background from setting
-            scene_background = f"{setting}. The scene has a neutral atmosphere with natural lighting. A calm and peaceful environment."
-            
-            segments.append({
+        # Create a basic scene background from setting
+        scene_background = f"{setting}. The scene has a neutral atmosphere with natural lighting. A calm and peaceful environment."
+        
+        # Create segments from paragraphs (each gets its own lists, since segments are edited downstream)
+        return [
+            {
                 "scene_number": i,
                 "description": paragraph[:200],  # First 200 chars
-                "characters": characters[:2] if characters else [],  # First 2 characters
+                "characters": list(characters),
                 "dialogue": None,
                 "narration": paragraph,
                 "duration_seconds": duration_per_segment,
                 "setting": setting,
                 "scene_background": scene_background,
                 "emotions": ["neutral"],
-            })
-        
-        return segments
+            }
+            for i, paragraph in enumerate(paragraphs[:num_segments], 1)
+        ]
+
 
+@lru_cache(maxsize=1)
+def get_segmenter() -> ScriptSegmentationAgent:
+    """
+    Get the shared script segmentation agent.
+    
+    The agent holds no per-story state, so one instance (with its prompts and output
+    parser) is reused for every segmentation in the process.
+    
+    Returns:
+        ScriptSegmentationAgent instance
+    """
+    return ScriptSegmentationAgent()
@@ -1,14 +1,14 @@
 """Story Generation Agent for creating engaging moral stories."""
 
+import asyncio
 import logging
-from typing import Dict, Any, Optional
-
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate, SystemMessagePromptTemplate, HumanMessagePromptTemplate
+from typing import Dict, Any, List, Optional
 
 from config import get_config
+from utils.llm_client import get_llm
 from utils.validators import validate_story_quality, validate_age_appropriateness
 from utils.helpers import sanitize_text
+from utils.rate_limiter import get_llm_rate_limiter, estimate_request_tokens
 
 logger = logging.getLogger(__name__)
 
@@ -19,13 +19,8 @@ class StoryGeneratorAgent:
     def __init__(self):
         """Initialize story generator agent."""
         self.config = get_config()
-        self.llm = ChatOpenAI(
-            model_name=self.config.llm.model,
-            temperature=self.config.llm.temperature,
-            max_tokens=self.config.llm.max_tokens,
-            api_key=self.config.llm.api_key,
-            base_url=self.config.llm.base_url
-        )
+        self.llm = get_llm(self.config.llm)
+        self.llm_rate_limiter = get_llm_rate_limiter(self.config.llm)
         
         # System prompt for story generation with robust safety guardrails
         self.system_prompt = """You are a loving grandma telling bedtime stories to Indian children. You speak in a warm, simple, and gentle way - just like a grandmother sitting with her grandchildren.
@@ -262,6 +257,9 @@ Your response must contain ONLY the story text in grandma's voice. Do not includ
 - Any explanations, notes, or meta-commentary
 
 Write the story now in simple English with grandma's loving voice (600-900 words):"""
+        
+        # System message is static, so build it once
+        self._system_message = {"role": "system", "content": self.system_prompt}
 
     def generate(
         self,
@@ -281,56 +279,122 @@ Write the story now in simple English with grandma's loving voice (600-900 words
         try:
             logger.info("Generating moral story")
             
-            # Format context for prompt
-            context_text = self._format_context(context)
-            
-            # Use research summary if available
-            if not research_summary:
-                research_summary = "No additional research information available."
-            
-            # Create prompt
-            prompt = ChatPromptTemplate.from_messages([
-                SystemMessagePromptTemplate.from_template(self.system_prompt),
-                HumanMessagePromptTemplate.from_template(self.human_prompt)
-            ])
-            
-            formatted_prompt = prompt.format_messages(
-                context=context_text,
-                research_summary=research_summary,
-                moral_lesson=context.get("moral_lesson", ""),
-                age_group=context.get("age_group", "6-8")
-            )
-            
             # Call LLM
-            response = self.llm.invoke(formatted_prompt)
-            story = sanitize_text(response.content).strip()
-            
-            # Validate story quality
-            is_valid, error_message = validate_story_quality(story, context)
-            if not is_valid:
-                logger.warning(f"Story validation warning: {error_message}")
-                # Continue anyway, but log warning
+            messages = self._format_prompt(context, research_summary)
+            self.llm_rate_limiter.acquire(estimate_request_tokens(messages, self.config.llm))
+            response = self.llm.invoke(messages)
+            return self._build_result(response.content, context)
             
-            # Check age appropriateness
-            age_group = context.get("age_group", "6-8")
-            is_appropriate, warning = validate_age_appropriateness(story, age_group)
-            if not is_appropriate:
-                logger.warning(f"Age appropriateness warning: {warning}")
-            
-            # Generate metadata
-            metadata = self._generate_metadata(story, context)
+        except Exception as e:
+            logger.error(f"Error generating story: {e}")
+            raise
+    
+    async def agenerate(
+        self,
+        context: Dict[str, Any],
+        research_summary: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Async version of generate, so several stories can be generated concurrently.
+        
+        Args:
+            context: Validated context with theme, characters, setting, moral lesson, age group
+            research_summary: Optional research summary from web research
             
-            logger.info(f"Story generated successfully ({len(story)} characters)")
+        Returns:
+            Dictionary with generated story and metadata
+        """
+        try:
+            logger.info("Generating moral story")
             
-            return {
-                "story": story,
-                "metadata": metadata
-            }
+            # Call LLM
+            messages = self._format_prompt(context, research_summary)
+            await self.llm_rate_limiter.aacquire(estimate_request_tokens(messages, self.config.llm))
+            response = await self.llm.ainvoke(messages)
+            return self._build_result(response.content, context)
             
         except Exception as e:
             logger.error(f"Error generating story: {e}")
             raise
     
+    async def agenerate_batch(
+        self,
+        contexts: List[Dict[str, Any]],
+        research_summaries: Optional[List[Optional[str]]] = None,
+        max_concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate stories for many contexts concurrently.
+        
+        Args:
+            contexts: Validated contexts, one per story
+            research_summaries: Optional research summaries, in the same order as contexts
+            max_concurrency: Maximum parallel requests (defaults to the configured limit)
+            
+        Returns:
+            Generated stories with metadata, in the same order as contexts
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.config.llm.max_concurrency)
+        summaries = research_summaries or [None] * len(contexts)
+        
+        async def generate_one(context: Dict[str, Any], research_summary: Optional[str]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.agenerate(context, research_summary)
+        
+        logger.info(f"Generating {len(contexts)} stories")
+        return await asyncio.gather(*(generate_one(context, summary) for context, summary in zip(contexts, summaries)))
+    
+    def _format_prompt(self, context: Dict[str, Any], research_summary: Optional[str]) -> List[Dict[str, str]]:
+        """Format the story generation prompt messages for a context."""
+        # Use research summary if available
+        if not research_summary:
+            research_summary = "No additional research information available."
+        
+        human_message = self.human_prompt.format(
+            context=self._format_context(context),
+            research_summary=research_summary,
+            moral_lesson=context.get("moral_lesson", ""),
+            age_group=context.get("age_group", "6-8")
+        )
+        return [self._system_message, {"role": "user", "content": human_message}]
+    
+    def _build_result(self, content: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate a generated story and attach its metadata.
+        
+        The checks are quick string scans, so they run inline rather than in a thread.
+        
+        Args:
+            content: Raw LLM response text
+            context: Context the story was generated for
+            
+        Returns:
+            Dictionary with generated story and metadata
+        """
+        story = sanitize_text(content).strip()
+        
+        # Validate story quality
+        is_valid, error_message = validate_story_quality(story, context)
+        if not is_valid:
+            logger.warning(f"Story validation warning: {error_message}")
+            # Continue anyway, but log warning
+        
+        # Check age appropriateness
+        age_group = context.get("age_group", "6-8")
+        is_appropriate, warning = validate_age_appropriateness(story, age_group)
+        if not is_appropriate:
+            logger.warning(f"Age appropriateness warning: {warning}")
+        
+        # Generate metadata
+        metadata = self._generate_metadata(story, context)
+        
+        logger.info(f"Story generated successfully ({len(story)} characters)")
+        
+        return {
+            "story": story,
+            "metadata": metadata
+        }
+    
     def _format_context(self, context: Dict[str, Any]) -> str:
         """
         Format context for prompt.
@@ -393,13 +457,14 @@ Write the story now in simple English with grandma's loving voice (600-900 words
         # Estimate reading time (average 200 words per minute)
         estimated_reading_time = word_count / 200.0
         
-        # Count character mentions
+        # Count character mentions (lowercasing the story once for all names)
         characters = context.get("characters", [])
+        story_lower = story.lower()
         character_mentions = {}
         for char in characters:
             name = char.get("name", "")
             if name:
-                character_mentions[name] = story.lower().count(name.lower())
+                character_mentions[name] = story_lower.count(name.lower())
         
         return {
             "word_count": word_count,
@@ -3,12 +3,11 @@
 import logging
 from typing import Dict, Any, List, Optional
 
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate, SystemMessagePromptTemplate, HumanMessagePromptTemplate
-
 from config import get_config
+from utils.llm_client import get_llm
 from tools.search_tool import WebSearchTool
 from utils.helpers import sanitize_text
+from utils.rate_limiter import get_llm_rate_limiter, estimate_request_tokens
 
 logger = logging.getLogger(__name__)
 
@@ -19,13 +18,8 @@ class WebResearchAgent:
     def __init__(self):
         """Initialize web research agent."""
         self.config = get_config()
-        self.llm = ChatOpenAI(
-            model_name=self.config.llm.model,
-            temperature=self.config.llm.temperature,
-            max_tokens=self.config.llm.max_tokens,
-            api_key=self.config.llm.api_key,
-            base_url=self.config.llm.base_url
-        )
+        self.llm = get_llm(self.config.llm)
+        self.llm_rate_limiter = get_llm_rate_limiter(self.config.llm)
         self.search_tool = WebSearchTool()
         
         # System prompt for research summarization
@@ -56,6 +50,9 @@ Search Results:
 
 Create a comprehensive research summary that can be used to enhance story generation.
 Focus on actionable insights for creating an engaging, age-appropriate moral story."""
+        
+        # System message is static, so build it once
+        self._system_message = {"role": "system", "content": self.system_prompt}
 
     def research(
         self,
@@ -100,17 +97,14 @@ Focus on actionable insights for creating an engaging, age-appropriate moral sto
             search_results_text = self._format_search_results(all_results)
             
             # Create prompt
-            prompt = ChatPromptTemplate.from_messages([
-                SystemMessagePromptTemplate.from_template(self.system_prompt),
-                HumanMessagePromptTemplate.from_template(self.human_prompt)
-            ])
-            
-            formatted_prompt = prompt.format_messages(
+            human_message = self.human_prompt.format(
                 context=self._format_context(context),
                 search_results=search_results_text
             )
+            formatted_prompt = [self._system_message, {"role": "user", "content": human_message}]
             
             # Call LLM for summarization
+            self.llm_rate_limiter.acquire(estimate_request_tokens(formatted_prompt, self.config.llm))
             response = self.llm.invoke(formatted_prompt)
             research_summary = sanitize_text(response.content)
             
@@ -1,7 +1,7 @@
 """Configuration management for the moral video workflow system."""
 
 import os
-from typing import Optional
+from typing import Optional, List
 from dataclasses import dataclass, field
 from pathlib import Path
 
@@ -15,6 +15,11 @@ class LLMConfig:
     max_tokens: int = 5000
     api_key: Optional[str] = None
     base_url: Optional[str] = None
+    max_concurrency: int = 4  # Maximum parallel story generation requests in a batch
+    
+    # Rate limiting settings (provider account limits)
+    max_requests_per_minute: int = 500
+    max_tokens_per_minute: int = 200000
     
     def __post_init__(self):
         """Load API key and base URL from environment if not provided."""
@@ -25,6 +30,20 @@ class LLMConfig:
         
         if self.base_url is None:
             self.base_url = os.getenv("LLM_BASE_URL")
+        
+        # Override batch concurrency if specified in env
+        env_max_concurrency = os.getenv("LLM_MAX_CONCURRENCY")
+        if env_max_concurrency:
+            self.max_concurrency = int(env_max_concurrency)
+        
+        # Override rate limits if specified in env
+        env_rpm = os.getenv("LLM_MAX_REQUESTS_PER_MINUTE")
+        if env_rpm:
+            self.max_requests_per_minute = int(env_rpm)
+        
+        env_tpm = os.getenv("LLM_MAX_TOKENS_PER_MINUTE")
+        if env_tpm:
+            self.max_tokens_per_minute = int(env_tpm)
 
 
 @dataclass
@@ -37,6 +56,11 @@ class ScriptSegmenterLLMConfig:
     max_tokens: int = 12000
     api_key: Optional[str] = None
     base_url: Optional[str] = None
+    max_concurrency: int = 8  # Maximum parallel segmentation requests in a batch
+    speculative_temperatures: List[float] = field(default_factory=list)  # Concurrent async variants (empty = single request)
+    prompt_cache_key: Optional[str] = None  # OpenAI prompt caching routing key
+    async_http_backend: str = "httpx"  # or "aiohttp" for high-concurrency batches
+    structured_output: bool = False  # Enforce the segment schema with OpenAI structured outputs
     
     def __post_init__(self):
         """Load API key and base URL from environment if not provided."""
@@ -63,6 +87,31 @@ class ScriptSegmenterLLMConfig:
         env_max_tokens = os.getenv("SCRIPT_SEGMENTER_MAX_TOKENS")
         if env_max_tokens:
             self.max_tokens = int(env_max_tokens)
+        
+        # Override batch concurrency if specified in env
+        env_max_concurrency = os.getenv("SCRIPT_SEGMENTER_MAX_CONCURRENCY")
+        if env_max_concurrency:
+            self.max_concurrency = int(env_max_concurrency)
+        
+        # Override speculative variant temperatures if specified in env (e.g. "0.2,0.5,0.8")
+        env_speculative = os.getenv("SCRIPT_SEGMENTER_SPECULATIVE_TEMPERATURES")
+        if env_speculative:
+            self.speculative_temperatures = [float(t) for t in env_speculative.split(",") if t.strip()]
+        
+        # Prompt cache routing key (OpenAI prompt_cache_key)
+        env_cache_key = os.getenv("SCRIPT_SEGMENTER_PROMPT_CACHE_KEY")
+        if env_cache_key:
+            self.prompt_cache_key = env_cache_key
+        
+        # Override async HTTP transport if specified in env
+        env_http_backend = os.getenv("SCRIPT_SEGMENTER_ASYNC_HTTP_BACKEND")
+        if env_http_backend:
+            self.async_http_backend = env_http_backend.lower()
+        
+        # Enable structured outputs if specified in env (needs a model that supports json_schema)
+        env_structured = os.getenv("SCRIPT_SEGMENTER_STRUCTURED_OUTPUT")
+        if env_structured:
+            self.structured_output = env_structured.lower() in ("1", "true", "yes")
 
 
 @dataclass
@@ -75,6 +124,7 @@ class CharacterDesignerLLMConfig:
     max_tokens: int = 5000
     api_key: Optional[str] = None
     base_url: Optional[str] = None
+    prompt_cache_key: Optional[str] = None  # OpenAI prompt caching routing key
     
     def __post_init__(self):
         """Load API key and base URL from environment if not provided."""
@@ -101,6 +151,11 @@ class CharacterDesignerLLMConfig:
         env_max_tokens = os.getenv("CHARACTER_DESIGNER_MAX_TOKENS")
         if env_max_tokens:
             self.max_tokens = int(env_max_tokens)
+        
+        # Override prompt cache key if specified in env
+        env_cache_key = os.getenv("CHARACTER_DESIGNER_PROMPT_CACHE_KEY")
+        if env_cache_key:
+            self.prompt_cache_key = env_cache_key
 
 
 @dataclass
@@ -144,6 +199,12 @@ class ImageGenConfig:
     sd_steps: int = 30
     sd_cfg_scale: float = 7.0
     sd_sampler: str = "DPM++ 2M Karras"
+    sd_model_id: str = "stabilityai/stable-diffusion-xl-base-1.0"  # Local diffusers model (stable-diffusion provider)
+    
+    # Concurrency settings
+    max_concurrency: int = 4  # Maximum parallel image generation requests
+    max_requests_per_minute: int = 50  # Provider images-per-minute limit
+    batch_size: int = 4  # Prompts per forward pass for local batched pipelines
     
     def __post_init__(self):
         """Load configuration from environment variables."""
@@ -214,6 +275,23 @@ class ImageGenConfig:
         if env_sd_sampler:
             self.sd_sampler = env_sd_sampler
         
+        env_sd_model_id = os.getenv("SD_MODEL_ID")
+        if env_sd_model_id:
+            self.sd_model_id = env_sd_model_id
+        
+        # Load concurrency settings
+        env_max_concurrency = os.getenv("IMAGE_GEN_MAX_CONCURRENCY")
+        if env_max_concurrency:
+            self.max_concurrency = int(env_max_concurrency)
+        
+        env_image_rpm = os.getenv("IMAGE_GEN_MAX_REQUESTS_PER_MINUTE")
+        if env_image_rpm:
+            self.max_requests_per_minute = int(env_image_rpm)
+        
+        env_batch_size = os.getenv("IMAGE_GEN_BATCH_SIZE")
+        if env_batch_size:
+            self.batch_size = int(env_batch_size)
+        
         # Validate API key
         if not self.api_key:
             logger_msg = f"Warning: {self.provider.upper()} API key not found. Image generation may fail."
@@ -257,6 +335,8 @@ class RetryConfig:
     initial_backoff: float = 1.0  # seconds
     max_backoff: float = 60.0  # seconds
     exponential_base: float = 2.0
+    circuit_breaker_threshold: int = 5  # consecutive failures before failing fast
+    circuit_breaker_reset_timeout: float = 60.0  # seconds before retrying a failed provider
 
 
 @dataclass
@@ -302,8 +382,15 @@ class WorkflowConfig:
     enable_auto_checkpoint: bool = True  # Automatically save checkpoints after each step
     checkpoint_retention_count: int = 10  # Number of checkpoints to retain per workflow
     
+    # Cache settings
+    enable_response_cache: bool = True  # Reuse LLM responses and images for identical inputs
+    
     def __post_init__(self):
         """Post-initialization setup."""
+        env_cache = os.getenv("ENABLE_RESPONSE_CACHE")
+        if env_cache:
+            self.enable_response_cache = env_cache.lower() in ("1", "true", "yes")
+        
         # Share OpenAI API key between LLM and DALL-E if using same provider
         if self.image_gen.provider == "dalle3" and self.llm.provider == "openai" and not self.image_gen.api_key:
             self.image_gen.api_key = self.llm.api_key
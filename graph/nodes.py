@@ -10,7 +10,7 @@ from graph.state import MoralVideoState, update_progress, add_error
 from agents.context_analyzer import ContextAnalyzerAgent
 from agents.web_researcher import WebResearchAgent
 from agents.story_generator import StoryGeneratorAgent
-from agents.script_segmenter import ScriptSegmentationAgent
+from agents.script_segmenter import get_segmenter
 from agents.character_designer import CharacterDesignAgent
 from agents.video_assembler import VideoAssemblyAgent
 from config import get_config
@@ -300,7 +300,7 @@ def script_segmenter_node(state: MoralVideoState) -> Dict[str, Any]:
         Updated state dictionary
     """
     config = get_config()
-    agent = ScriptSegmentationAgent()
+    agent = get_segmenter()
     
     try:
         logger.info("Executing script segmenter node")
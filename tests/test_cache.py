@@ -0,0 +1,56 @@
+"""Test script to verify the exact-match response cache."""
+
+import logging
+
+from utils.cache import stable_hash, load_cached, save_cached, CharacterReferenceIndex
+from utils.helpers import get_temp_path
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def test_stable_hash_ignores_key_order():
+    """Test that equal inputs hash identically regardless of dict ordering."""
+    first = stable_hash({"chars": [{"name": "Leo", "traits": ["brave"]}], "style": "cartoon"})
+    second = stable_hash({"style": "cartoon", "chars": [{"traits": ["brave"], "name": "Leo"}]})
+    different = stable_hash({"style": "watercolor", "chars": [{"traits": ["brave"], "name": "Leo"}]})
+    
+    assert first == second
+    assert first != different
+    
+    logger.info("✓ Stable hash ignores key order")
+
+
+def test_cache_round_trip():
+    """Test that cached values are returned for the same key and missing keys miss."""
+    key = stable_hash({"test": "cache_round_trip"})
+    value = {"Leo": "A golden lion with a flowing mane"}
+    
+    save_cached("test_cache", key, value)
+    assert load_cached("test_cache", key) == value
+    assert load_cached("test_cache", stable_hash({"test": "missing"})) is None
+    
+    logger.info("✓ Cache round trip works")
+
+
+def test_character_reference_index():
+    """Test that indexed references are returned only while their image exists."""
+    index = CharacterReferenceIndex(get_temp_path("test_char_ref_index.sqlite", "test_cache"))
+    image_path = get_temp_path("leo_reference.png", "test_cache")
+    image_path.write_bytes(b"png")
+    
+    key = stable_hash({"name": "Leo", "type": "lion"})
+    index.put(key, {"reference_image_path": str(image_path), "visual_analysis": "golden mane"})
+    assert index.get(key)["visual_analysis"] == "golden mane"
+    
+    image_path.unlink()
+    assert index.get(key) is None
+    assert index.get(stable_hash({"name": "Mia"})) is None
+    
+    logger.info("✓ Character reference index works")
+
+
+if __name__ == "__main__":
+    test_stable_hash_ignores_key_order()
+    test_cache_round_trip()
+    test_character_reference_index()
@@ -0,0 +1,78 @@
+"""Test script to verify the character designer module structure."""
+
+import ast
+import logging
+from pathlib import Path
+
+from agents import CharacterDesignAgent
+from utils.helpers import get_temp_path
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MODULE_PATH = Path(__file__).resolve().parent.parent / "agents" / "character_designer.py"
+
+
+def test_single_character_design_agent_definition():
+    """Test that the module defines CharacterDesignAgent exactly once and exports that class."""
+    tree = ast.parse(MODULE_PATH.read_text(encoding="utf-8"))
+    definitions = [
+        node for node in tree.body
+        if isinstance(node, ast.ClassDef) and node.name == "CharacterDesignAgent"
+    ]
+    
+    assert len(definitions) == 1
+    assert CharacterDesignAgent.__qualname__ == "CharacterDesignAgent"
+    assert CharacterDesignAgent.__module__ == "agents.character_designer"
+    
+    logger.info("✓ CharacterDesignAgent is defined once")
+
+
+def test_parse_llm_design_output():
+    """Test that JSON designs parse whether bare, fenced or wrapped in prose."""
+    agent = CharacterDesignAgent()
+    characters = [{"name": "Leo"}, {"name": "Mia"}]
+    designs = '[{"name": "leo", "description": "A golden  lion"}, {"name": "Mia", "description": "A grey owl"}]'
+    expected = {"Leo": "A golden lion", "Mia": "A grey owl"}
+    
+    assert agent._parse_llm_design_output(designs, characters) == expected
+    assert agent._parse_llm_design_output(f"```json\n{designs}\n```", characters) == expected
+    assert agent._parse_llm_design_output(f"Here you go:\n{designs}\nEnjoy!", characters) == expected
+    
+    logger.info("✓ JSON character designs are parsed")
+
+
+def test_duplicate_scenes_share_one_generation():
+    """Test that scenes with identical prompts are generated once and get their own image copies."""
+    workflow_id = "test_scene_dedupe"
+    agent = CharacterDesignAgent(workflow_id=workflow_id)
+    generated = []
+    
+    def generate_scene_image(**kwargs):
+        generated.append(kwargs["scene_number"])
+        image_path = get_temp_path(f"scene_{kwargs['scene_number']:03d}.png", "images", workflow_id)
+        image_path.write_bytes(f"scene {kwargs['scene_number']}".encode())
+        return image_path
+    
+    agent.image_tool.generate_scene_image = generate_scene_image
+    agent._batch_enrich_scenes = lambda segments, references: [None] * len(segments)
+    
+    scene = {"description": "Leo finds a golden acorn", "narration": "Leo found it.", "characters": [], "setting": "forest", "emotions": ["joy"]}
+    segments = [
+        dict(scene, scene_number=1),
+        dict(scene, scene_number=2, description="Mia flies over the oak tree"),
+        dict(scene, scene_number=3),
+    ]
+    images = agent.generate_scene_images(segments, {}, {})
+    
+    assert sorted(generated) == [1, 2]
+    assert images[2] != images[0]
+    assert images[2].read_bytes() == images[0].read_bytes() == b"scene 1"
+    
+    logger.info("✓ Duplicate scenes share one generation")
+
+
+if __name__ == "__main__":
+    test_single_character_design_agent_definition()
+    test_parse_llm_design_output()
+    test_duplicate_scenes_share_one_generation()
@@ -0,0 +1,69 @@
+"""Test script to verify the image provider circuit breaker."""
+
+import time
+import logging
+
+from utils.circuit_breaker import CircuitBreaker
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def test_circuit_opens_after_consecutive_failures():
+    """Test that the circuit opens at the threshold and a success resets the count."""
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=60)
+    
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.allow_request()
+    
+    breaker.record_failure()
+    assert not breaker.allow_request()
+    
+    logger.info("✓ Circuit opens after consecutive failures")
+
+
+def test_circuit_allows_trial_after_timeout():
+    """Test that a trial request is allowed after the reset timeout and success closes the circuit."""
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.05)
+    
+    breaker.record_failure()
+    assert not breaker.allow_request()
+    
+    time.sleep(0.06)
+    assert breaker.allow_request()
+    
+    breaker.record_success()
+    assert breaker.allow_request()
+    assert breaker.failure_count == 0
+    
+    logger.info("✓ Circuit allows a trial request after the reset timeout")
+
+
+def test_circuit_allows_single_trial_until_outcome():
+    """Test that only one trial request is let through after the timeout until it reports back."""
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.05)
+    
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    
+    # A failed trial reopens the circuit for another full timeout
+    breaker.record_failure()
+    assert not breaker.allow_request()
+    
+    time.sleep(0.06)
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    
+    logger.info("✓ Circuit allows a single trial request until its outcome is recorded")
+
+
+if __name__ == "__main__":
+    test_circuit_opens_after_consecutive_failures()
+    test_circuit_allows_trial_after_timeout()
+    test_circuit_allows_single_trial_until_outcome()
@@ -0,0 +1,79 @@
+"""Test script to verify batched summarization and scene image jobs."""
+
+import json
+import logging
+import threading
+from types import SimpleNamespace
+
+from tools.image_gen_tool import ImageGenerationTool
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class FakeSummaryLLM:
+    """Stand-in chat model returning a fixed summarization response."""
+    
+    def __init__(self, content: str):
+        self.content = content
+        self.calls = 0
+    
+    def invoke(self, messages, **kwargs):
+        self.calls += 1
+        return SimpleNamespace(content=self.content)
+
+
+def test_batch_summaries_are_split_back_by_index():
+    """Test that batched summaries map back to their entries and missing ones are truncated."""
+    tool = ImageGenerationTool()
+    long_leo = "Leo is a brave golden lion. " * 20
+    long_mia = "Mia is a wise grey owl. " * 20
+    # Out of order and wrapped in prose; the summary for entry 2 (Mia) is missing
+    tool.llm = FakeSummaryLLM("Here are the summaries:\n" + json.dumps([
+        {"index": 3, "summary": "Sam, a small red fox."},
+        {"index": 1, "summary": "Leo, a brave golden lion."},
+    ]))
+    
+    results = tool.summarize_character_descriptions_batch(
+        [long_leo, "Short description", long_mia, "Sam " * 100],
+        max_length=200
+    )
+    
+    assert tool.llm.calls == 1
+    assert results[0] == "Leo, a brave golden lion."
+    assert results[1] == "Short description"
+    assert results[2] == long_mia[:197] + "..."
+    assert results[3] == "Sam, a small red fox."
+    
+    logger.info("✓ Batched summaries are split back by index")
+
+
+def test_cancel_job_drops_unawaited_jobs():
+    """Test that cancelled jobs leave the job table and pending ones never run."""
+    tool = ImageGenerationTool()
+    release = threading.Event()
+    started = []
+    
+    def generate_scene_image(**kwargs):
+        started.append(kwargs["scene_number"])
+        release.wait(5)
+        return None
+    
+    tool.generate_scene_image = generate_scene_image
+    job_ids = [tool.submit_scene_image_job(scene_number=number) for number in range(tool._job_executor._max_workers + 1)]
+    
+    # The last job is still queued behind the busy workers, so it can be cancelled
+    assert tool.cancel_job(job_ids[-1])
+    for job_id in job_ids[:-1]:
+        tool.cancel_job(job_id)
+    release.set()
+    
+    assert not tool._jobs
+    assert len(job_ids) - 1 not in started
+    
+    logger.info("✓ Unawaited image jobs are dropped")
+
+
+if __name__ == "__main__":
+    test_batch_summaries_are_split_back_by_index()
+    test_cancel_job_drops_unawaited_jobs()
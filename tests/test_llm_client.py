@@ -0,0 +1,97 @@
+"""Test script to verify shared LLM client reuse."""
+
+import asyncio
+import logging
+
+from config import LLMConfig
+from utils.llm_client import get_llm, get_async_llm, async_llm_session
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def test_get_llm_shares_instances():
+    """Test that equal settings share one client and overrides get their own."""
+    llm_config = LLMConfig(api_key="test-key")
+    
+    assert get_llm(llm_config) is get_llm(LLMConfig(api_key="test-key"))
+    assert get_llm(llm_config, temperature=0.3) is not get_llm(llm_config)
+    assert get_llm(llm_config, temperature=0.3).http_client is get_llm(llm_config).http_client
+    
+    logger.info("✓ LLM clients are shared")
+
+
+def test_get_async_llm_defaults_to_shared_instance():
+    """Test that async calls reuse the shared client unless aiohttp is configured."""
+    llm_config = LLMConfig(api_key="test-key")
+    
+    assert get_async_llm(llm_config) is get_llm(llm_config)
+    
+    logger.info("✓ Async LLM calls share the default client")
+
+
+def test_async_llm_session_closes_after_last_user():
+    """Test that aiohttp sessions stay open while any caller uses them and close after the last."""
+    llm_config = LLMConfig(api_key="test-key")
+    llm_config.async_http_backend = "aiohttp"
+    
+    async def run():
+        assert get_async_llm(llm_config) is get_llm(llm_config)  # no session outside the block
+        async with async_llm_session():
+            llm = get_async_llm(llm_config)
+            async with async_llm_session():
+                assert get_async_llm(llm_config) is llm
+            still_open = llm.http_async_client is None or not llm.http_async_client.is_closed
+        async with async_llm_session():
+            reopened = get_async_llm(llm_config)
+        return llm, still_open, reopened
+    
+    llm, still_open, reopened = asyncio.run(run())
+    assert still_open
+    if llm.http_async_client is not None:  # openai installed with aiohttp support
+        assert llm.http_async_client.is_closed
+        assert reopened is not llm
+    
+    logger.info("✓ Async LLM sessions are closed after their last user")
+
+
+def test_overlapping_batches_share_open_sessions():
+    """Test that a batch finishing first does not close the session another batch is still using."""
+    from agents.script_segmenter import ScriptSegmentationAgent
+    
+    agent = ScriptSegmentationAgent()
+    llm_config = agent.config.script_segmenter_llm
+    original_backend = llm_config.async_http_backend
+    llm_config.async_http_backend = "aiohttp"
+    closed_mid_request = []
+    
+    async def fake_asegment(story, context, duration):
+        llm = get_async_llm(llm_config)
+        await asyncio.sleep(0.05 if story == "slow" else 0)
+        closed_mid_request.append(llm.http_async_client is not None and llm.http_async_client.is_closed)
+        return [{"narration": story}]
+    
+    agent.asegment = fake_asegment
+    
+    async def run():
+        return await asyncio.gather(
+            agent.asegment_batch([("slow", {})], 1),
+            agent.asegment_batch([("fast", {})], 1)
+        )
+    
+    try:
+        slow, fast = asyncio.run(run())
+    finally:
+        llm_config.async_http_backend = original_backend
+    
+    assert slow == [[{"narration": "slow"}]] and fast == [[{"narration": "fast"}]]
+    assert closed_mid_request == [False, False]
+    
+    logger.info("✓ Overlapping batches keep their sessions open")
+
+
+if __name__ == "__main__":
+    test_get_llm_shares_instances()
+    test_get_async_llm_defaults_to_shared_instance()
+    test_async_llm_session_closes_after_last_user()
+    test_overlapping_batches_share_open_sessions()
@@ -0,0 +1,102 @@
+"""Test script to verify the token-bucket rate limiter."""
+
+import time
+import asyncio
+import logging
+
+from config import LLMConfig, ScriptSegmenterLLMConfig
+from utils.rate_limiter import TokenBucketRateLimiter, estimate_tokens, get_rate_limiter, get_llm_rate_limiter
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def test_request_capacity_is_consumed_and_replenished():
+    """Test that request capacity is exhausted by bursts and refills over time."""
+    limiter = TokenBucketRateLimiter(max_requests_per_minute=600)  # 10 requests per second
+    
+    # Full bucket allows a burst up to the per-minute limit
+    acquired = sum(1 for _ in range(600) if limiter.try_acquire())
+    assert acquired == 600
+    assert not limiter.try_acquire()
+    
+    # ~0.2s replenishes ~2 requests
+    time.sleep(0.2)
+    assert limiter.try_acquire()
+    
+    logger.info("✓ Request capacity is consumed and replenished")
+
+
+def test_token_capacity_limits_requests():
+    """Test that token capacity blocks requests before request capacity does."""
+    limiter = TokenBucketRateLimiter(max_requests_per_minute=1000, max_tokens_per_minute=1000)
+    
+    assert limiter.try_acquire(tokens=600)
+    assert not limiter.try_acquire(tokens=600)
+    
+    # Requests larger than the whole bucket are clamped so they can still proceed
+    limiter = TokenBucketRateLimiter(max_requests_per_minute=1000, max_tokens_per_minute=1000)
+    assert limiter.try_acquire(tokens=5000)
+    
+    logger.info("✓ Token capacity limits requests")
+
+
+def test_acquire_waits_for_capacity():
+    """Test that blocking and async acquire wait until capacity is available."""
+    limiter = TokenBucketRateLimiter(max_requests_per_minute=1200, poll_interval=0.01)  # 20 requests per second
+    while limiter.try_acquire():
+        pass
+    
+    start = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - start >= 0.03
+    
+    start = time.monotonic()
+    asyncio.run(limiter.aacquire())
+    assert time.monotonic() - start >= 0.03
+    
+    logger.info("✓ Acquire waits for capacity")
+
+
+def test_estimate_tokens():
+    """Test that token estimates are positive and scale with prompt length."""
+    assert estimate_tokens("") == 1
+    short = estimate_tokens("A brave lion in a magical forest.")
+    long = estimate_tokens("A brave lion in a magical forest. " * 50)
+    assert 0 < short < long
+    
+    logger.info("✓ Token estimates scale with prompt length")
+
+
+def test_get_rate_limiter_is_shared():
+    """Test that limiters for the same account are shared, so capacity is drawn from one bucket."""
+    first = get_rate_limiter("test_account", 600, 1000)
+    second = get_rate_limiter("test_account", 600, 1000)
+    assert first is second
+    assert get_rate_limiter("other_account", 600, 1000) is not first
+    
+    assert first.try_acquire(1000)
+    assert not second.try_acquire(1000)
+    
+    logger.info("✓ Rate limiters are shared per account")
+
+
+def test_llm_rate_limiter_is_keyed_by_account():
+    """Test that agent configs share a limiter only when they call the same key and endpoint."""
+    general = LLMConfig(api_key="general-key", base_url="https://api.example.com/v1")
+    same_account = ScriptSegmenterLLMConfig(api_key="general-key", base_url="https://api.example.com/v1")
+    other_account = ScriptSegmenterLLMConfig(api_key="segmenter-key", base_url="https://other.example.com/v1")
+    
+    assert get_llm_rate_limiter(general) is get_llm_rate_limiter(same_account)
+    assert get_llm_rate_limiter(general) is not get_llm_rate_limiter(other_account)
+    
+    logger.info("✓ LLM rate limiters are keyed by account")
+
+
+if __name__ == "__main__":
+    test_request_capacity_is_consumed_and_replenished()
+    test_token_capacity_limits_requests()
+    test_acquire_waits_for_capacity()
+    test_estimate_tokens()
+    test_get_rate_limiter_is_shared()
+    test_llm_rate_limiter_is_keyed_by_account()
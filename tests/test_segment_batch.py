@@ -0,0 +1,40 @@
+"""Test script to verify identical segmentation requests in a batch are grouped."""
+
+import asyncio
+import logging
+
+from agents.script_segmenter import ScriptSegmentationAgent
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def test_duplicate_batch_items_share_one_call():
+    """Test that duplicate stories are segmented once and each item gets its own copy."""
+    agent = ScriptSegmentationAgent()
+    calls = []
+    
+    async def fake_asegment(story, context, duration):
+        calls.append((story, duration))
+        return [{"scene_number": 1, "narration": story, "characters": ["Leo"]}]
+    
+    agent.asegment = fake_asegment
+    context = {"characters": [{"name": "Leo", "type": "lion", "traits": ["brave"]}], "setting": "forest"}
+    
+    results = asyncio.run(agent.asegment_batch([
+        ("Leo finds an acorn.", context),
+        ("Mia learns to fly.", context),
+        ("Leo finds an acorn.", dict(context), 3),
+        ("Leo finds an acorn.", context, 5),
+    ], target_duration_minutes=3))
+    
+    assert sorted(calls) == [("Leo finds an acorn.", 3), ("Leo finds an acorn.", 5), ("Mia learns to fly.", 3)]
+    assert results[0] == results[2]
+    assert results[0] is not results[2]
+    assert results[0][0]["characters"] is not results[2][0]["characters"]
+    
+    logger.info("✓ Duplicate batch items share one segmentation call")
+
+
+if __name__ == "__main__":
+    test_duplicate_batch_items_share_one_call()
@@ -114,6 +114,56 @@ As Leo thought about what to do, he remembered what his mother had taught him ab
             logger.warning(f"Last segment narration: {segments[-1].get('narration', '')[-100:]}")
 
 
+def test_story_coverage_validation():
+    """Test that verbatim narrations pass coverage validation and summaries fail."""
+    from agents.script_segmenter import ScriptSegmentationAgent
+    
+    story = (
+        "Leo the lion found a golden acorn under the old oak tree.\n\n"
+        "He carried it carefully to Mia, the wise owl, who had lost it.\n\n"
+        "\"Thank you, Leo!\" said Mia. Honesty made the whole forest happy."
+    )
+    verbatim = [{"narration": paragraph} for paragraph in story.split("\n\n")]
+    summarized = [{"narration": "Leo found an acorn."}, {"narration": "He gave it back."}]
+    # Every word is present, but the story is told out of order
+    reordered = list(reversed(verbatim))
+    
+    segmenter = ScriptSegmentationAgent()
+    
+    assert segmenter._validate_story_coverage(verbatim, story)
+    assert not segmenter._validate_story_coverage(summarized, story)
+    assert not segmenter._validate_story_coverage([{"narration": "  "}], story)
+    assert not segmenter._validate_story_coverage(reordered, story)
+    
+    logger.info("✓ Story coverage validation accepts verbatim and rejects summarized narration")
+
+
+def test_segment_stream_parser():
+    """Test that streamed segments are decoded as they close and only trusted when complete."""
+    from agents.script_segmenter import SegmentStreamParser
+    
+    segments = [
+        {"scene_number": 1, "narration": "Leo found a {golden} acorn.", "dialogue": "\"Mine?\" \\ }"},
+        {"scene_number": 2, "narration": "He gave it to Mia.", "dialogue": None},
+    ]
+    text = "```json\n" + json.dumps({"segments": segments}, indent=2) + "\n```"
+    
+    parser = SegmentStreamParser()
+    streamed = []
+    for start in range(0, len(text), 5):
+        streamed.extend(parser.feed(text[start:start + 5]))
+    
+    assert streamed == segments
+    assert parser.text == text
+    assert parser.complete_segments == segments
+    
+    truncated = SegmentStreamParser()
+    truncated.feed(text[:len(text) // 2])
+    assert truncated.complete_segments is None
+    
+    logger.info("✓ Stream parser decodes segments incrementally")
+
+
 def main():
     """Run the test."""
     logger.info("Testing Story Segmentation Coverage")
@@ -121,6 +171,8 @@ def main():
     
     try:
         test_segmentation_coverage()
+        test_story_coverage_validation()
+        test_segment_stream_parser()
         
     except Exception as e:
         logger.error(f"\\n❌ TEST FAILED: {e}")
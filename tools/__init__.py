@@ -4,6 +4,7 @@ from .search_tool import WebSearchTool
 from .image_gen_tool import ImageGenerationTool
 from .video_tool import VideoProcessingTool
 from .character_inference_tool import CharacterInferenceTool
+from .batch_tool import OpenAIBatchTool
 
-__all__ = ["WebSearchTool", "ImageGenerationTool", "VideoProcessingTool", "CharacterInferenceTool"]
+__all__ = ["WebSearchTool", "ImageGenerationTool", "VideoProcessingTool", "CharacterInferenceTool", "OpenAIBatchTool"]
 
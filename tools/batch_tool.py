@@ -0,0 +1,156 @@
+"""OpenAI Batch API integration for offline, discounted chat completion jobs."""
+
+import io
+import time
+import logging
+from typing import Dict, Any, List, Optional
+
+from config import get_config
+from utils.helpers import fast_json_loads, fast_json_dumps
+
+logger = logging.getLogger(__name__)
+
+# Batch statuses after which polling stops
+TERMINAL_BATCH_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+class OpenAIBatchTool:
+    """Submit chat completion requests through the OpenAI Batch API and collect results."""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        poll_interval: float = 30.0,
+        timeout: float = 24 * 60 * 60
+    ):
+        """
+        Initialize batch tool.
+
+        Args:
+            api_key: API key (defaults to the character designer LLM key)
+            base_url: Optional base URL (defaults to the character designer LLM base URL)
+            poll_interval: Seconds between batch status checks
+            timeout: Maximum seconds to wait for the batch to finish
+        """
+        from openai import OpenAI
+
+        self.config = get_config()
+        llm_config = self.config.character_designer_llm
+        self.client = OpenAI(
+            api_key=api_key or llm_config.api_key,
+            base_url=base_url or llm_config.base_url
+        )
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+
+    def run_chat_batch(
+        self,
+        requests: Dict[str, List[Dict[str, str]]],
+        model: str,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        extra_body: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, str]:
+        """
+        Run chat completion requests as a single batch job and wait for the results.
+
+        Args:
+            requests: Mapping of custom_id to OpenAI-format chat messages
+            model: Model name
+            temperature: Optional sampling temperature
+            max_tokens: Optional completion token limit
+            extra_body: Optional additional request body fields (e.g. response_format)
+
+        Returns:
+            Mapping of custom_id to response content (failed requests are omitted)
+        """
+        if not requests:
+            return {}
+
+        # Build the JSONL input file, one chat completion request per line
+        lines = []
+        for custom_id, messages in requests.items():
+            body = {"model": model, "messages": messages, **(extra_body or {})}
+            if temperature is not None:
+                body["temperature"] = temperature
+            if max_tokens is not None:
+                body["max_tokens"] = max_tokens
+            lines.append(fast_json_dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body,
+            }))
+
+        payload = io.BytesIO(b"\n".join(lines))
+        input_file = self.client.files.create(file=("batch_input.jsonl", payload), purpose="batch")
+
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info(f"Submitted batch {batch.id} with {len(requests)} request(s)")
+
+        batch = self._wait_for_batch(batch.id)
+
+        if batch.status != "completed" or not batch.output_file_id:
+            logger.error(f"Batch {batch.id} finished with status '{batch.status}'")
+            return {}
+
+        return self._parse_output(self.client.files.content(batch.output_file_id).text)
+
+    def _wait_for_batch(self, batch_id: str) -> Any:
+        """
+        Poll a batch until it reaches a terminal status or the timeout elapses.
+
+        Args:
+            batch_id: Batch ID
+
+        Returns:
+            Final batch object
+        """
+        start_time = time.time()
+
+        while True:
+            batch = self.client.batches.retrieve(batch_id)
+            if batch.status in TERMINAL_BATCH_STATUSES:
+                return batch
+
+            if time.time() - start_time > self.timeout:
+                logger.warning(f"Batch {batch_id} did not finish within {self.timeout:.0f}s, cancelling")
+                return self.client.batches.cancel(batch_id)
+
+            logger.info(f"Batch {batch_id} status: {batch.status}, waiting {self.poll_interval:.0f}s")
+            time.sleep(self.poll_interval)
+
+    def _parse_output(self, output_text: str) -> Dict[str, str]:
+        """
+        Parse the batch output JSONL into response contents.
+
+        Args:
+            output_text: Raw output file text
+
+        Returns:
+            Mapping of custom_id to response content
+        """
+        results = {}
+
+        for line in output_text.splitlines():
+            if not line.strip():
+                continue
+
+            record = fast_json_loads(line)
+            custom_id = record.get("custom_id")
+            response = record.get("response") or {}
+
+            if record.get("error") or response.get("status_code") != 200:
+                logger.warning(f"Batch request {custom_id} failed: {record.get('error') or response.get('status_code')}")
+                continue
+
+            choices = response.get("body", {}).get("choices", [])
+            if choices:
+                results[custom_id] = choices[0].get("message", {}).get("content", "")
+
+        return results
@@ -1,15 +1,12 @@
 """Character inference tool for analyzing story segments and inferring character details."""
 
 import logging
-import json
-import re
 from typing import Dict, Any, List, Optional
 
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
-
 from config import get_config
-from utils.helpers import sanitize_text
+from utils.llm_client import get_llm
+from utils.helpers import sanitize_text, extract_json_text, fast_json_loads
+from utils.rate_limiter import get_llm_rate_limiter, estimate_request_tokens
 
 logger = logging.getLogger(__name__)
 
@@ -20,16 +17,11 @@ class CharacterInferenceTool:
     def __init__(self):
         """Initialize character inference tool."""
         self.config = get_config()
-        self.llm = ChatOpenAI(
-            model_name=self.config.llm.model,
-            temperature=0.3,  # Lower temperature for more consistent inference
-            api_key=self.config.llm.api_key,
-            base_url=self.config.llm.base_url
-        )
+        self.llm = get_llm(self.config.llm, temperature=0.3)  # Lower temperature for more consistent inference
+        self.llm_rate_limiter = get_llm_rate_limiter(self.config.llm)
         
         # System prompt for character inference
-        self.inference_prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are a character analysis expert for children's stories. Your task is to analyze story segments and determine each character's type and personality traits.
+        self.system_prompt = """You are a character analysis expert for children's stories. Your task is to analyze story segments and determine each character's type and personality traits.
 
 For each character mentioned, you must infer:
 1. Character type: What kind of creature or being they are (e.g., lion, owl, monkey, phoenix, dragon, rabbit, fox, human child, wizard, etc.)
@@ -39,8 +31,9 @@ NOTE: If the character type and traits are already present in the character cont
 
 CRITICAL: You must respond with ONLY a valid JSON object. Do not include markdown code blocks, explanations, or any other text.
 
-The JSON must use the ACTUAL character names from the story as keys."""),
-            ("human", """Analyze these characters and infer their type and traits:
+The JSON must use the ACTUAL character names from the story as keys."""
+
+        self.human_prompt = """Analyze these characters and infer their type and traits:
 
 {character_info}
 
@@ -51,8 +44,10 @@ Story Context:
 
 Return a JSON object where each key is a character name and the value contains "type" and "traits":
 Example format (use ACTUAL character names, not these placeholders):
-{{"Max": {{"type": "monkey", "traits": ["mischievous", "clever"]}}, "Phoenix": {{"type": "phoenix", "traits": ["wise", "magical"]}}}}""")
-        ])
+{{"Max": {{"type": "monkey", "traits": ["mischievous", "clever"]}}, "Phoenix": {{"type": "phoenix", "traits": ["wise", "magical"]}}}}"""
+        
+        # System message is static, so build it once
+        self._system_message = {"role": "system", "content": self.system_prompt}
     
     def infer_characters_from_segments(
         self,
@@ -101,15 +96,17 @@ Example format (use ACTUAL character names, not these placeholders):
                         char_info_parts.append(f"  Traits: {existing_character_names[char_name]['traits']}")
              
             # Format prompt
-            formatted_prompt = self.inference_prompt.format_messages(
+            human_message = self.human_prompt.format(
                 character_info="\n".join(char_info_parts),
                 theme=story_context.get("theme", "N/A"),
                 setting=story_context.get("setting", "N/A"),
                 moral_lesson=story_context.get("moral_lesson", "N/A")
             )
+            formatted_prompt = [self._system_message, {"role": "user", "content": human_message}]
             
             # Call LLM
             logger.info("Calling LLM to infer character details")
+            self.llm_rate_limiter.acquire(estimate_request_tokens(formatted_prompt, self.config.llm))
             response = self.llm.invoke(formatted_prompt)
             
             # Log the full response for debugging
@@ -195,25 +192,17 @@ Example format (use ACTUAL character names, not these placeholders):
             # Extract JSON from response
             response_text = response_text.strip()
             
-            # Try to extract JSON from markdown code blocks first
-            # Pattern: ```json\n{...}\n``` or ```\n{...}\n```
-            code_block_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', response_text, re.DOTALL)
-            if code_block_match:
-                json_str = code_block_match.group(1)
-            else:
-                # Try to find JSON block without markdown
-                json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-                if json_match:
-                    json_str = json_match.group()
-                else:
-                    logger.warning("Could not find JSON in LLM response")
-                    logger.debug(f"Response text: {response_text[:200]}...")
-                    return {}
-            
-            # Parse JSON
+            # Take the JSON object out of any markdown fence or surrounding prose
+            json_str = extract_json_text(response_text)
+            if not json_str.startswith("{"):
+                logger.warning("Could not find JSON in LLM response")
+                logger.debug(f"Response text: {response_text[:200]}...")
+                return {}
+            
+            # Parse JSON (orjson when installed)
             try:
-                inferred_chars = json.loads(json_str)
-            except json.JSONDecodeError as e:
+                inferred_chars = fast_json_loads(json_str)
+            except ValueError as e:
                 logger.error(f"JSON decode error: {e}")
                 logger.debug(f"Attempted to parse: {json_str[:200]}...")
                 return {}
@@ -234,7 +223,7 @@ Example format (use ACTUAL character names, not these placeholders):
             
             return result
                 
-        except json.JSONDecodeError as e:
+        except ValueError as e:
             logger.error(f"Error parsing JSON from LLM response: {e}")
             logger.debug(f"Response text: {response_text[:500]}...")
             return {}
@@ -1,21 +1,81 @@
 """Image generation tool with multi-provider support (DALL-E 3, Gemini, OpenRouter SD)."""
 
+import re
 import time
+import uuid
+import shutil
+import asyncio
 import logging
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor, Future
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 from PIL import Image
 import io
 
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
-
 from config import get_config
-from utils.helpers import get_temp_path, sanitize_text
+from utils.llm_client import get_llm
+from utils.helpers import get_temp_path, sanitize_text, fast_json_loads, extract_json_text
+from utils.cache import stable_hash, load_cached, save_cached
+from utils.rate_limiter import get_llm_rate_limiter, estimate_request_tokens
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of descriptions condensed in a single batched summarization call.
+# Larger batches amortize the prompt header further but lengthen each response.
+SUMMARY_BATCH_SIZE = 10
+
+# Cache namespace for generated character reference images
+IMAGE_CACHE_NAMESPACE = "image_cache"
+
+# System prompt shared by single and batched character summarization
+SUMMARIZE_SYSTEM_PROMPT = """You are an expert at condensing character descriptions for image generation.
+Your task is to summarize character descriptions while preserving ALL essential visual details needed for consistent image generation.
+
+CRITICAL: Keep these details for each character:
+- Character name and type
+- Physical appearance (body shape, size, colors)
+- Distinctive features (ears, tail, facial features, clothing)
+- Key personality traits that affect appearance
+- Art style characteristics
+
+Remove redundant phrases and verbose explanations, but NEVER remove visual details."""
+
+SUMMARIZE_HUMAN_PROMPT = """Summarize the following character descriptions to approximately {target_length} characters while preserving all essential visual details:
+
+{characters_str}
+
+Provide a concise version that maintains character consistency for image generation."""
+
+BATCH_SUMMARIZE_HUMAN_PROMPT = """Summarize each of the following {count} numbered entries to approximately {target_length} characters while preserving all essential visual details:
+
+{entries}
+
+Respond with a strict JSON array and nothing else, one object per entry in the same order:
+[{{"index": <entry number>, "summary": "<condensed description>"}}]"""
+
+
+# Serializes forward passes through shared Stable Diffusion pipelines, whose scheduler
+# state is not thread-safe
+_SD_PIPELINE_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _shared_job_executor(max_workers: int) -> ThreadPoolExecutor:
+    """Create the worker pool shared by every tool's submitted scene image jobs."""
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="image_job")
+
+
+@lru_cache(maxsize=None)
+def _load_sd_pipeline(model_id: str, device: str, dtype: Any) -> Any:
+    """Load a Stable Diffusion pipeline; cached so every tool shares one copy per model and device."""
+    from diffusers import AutoPipelineForText2Image
+    
+    logger.info(f"Loading Stable Diffusion pipeline {model_id} on {device}")
+    return AutoPipelineForText2Image.from_pretrained(model_id, torch_dtype=dtype).to(device)
+
 
 class ImageGenerationTool:
     """Image generation tool with multi-provider support."""
@@ -32,14 +92,16 @@ class ImageGenerationTool:
         self.workflow_id = workflow_id
         self._initialize_client()
         
+        # Submitted scene image jobs, keyed by job ID; the worker pool is shared by all tools
+        self._job_executor = _shared_job_executor(max(1, self.config.image_gen.max_concurrency))
+        self._jobs: Dict[str, Future] = {}
+        
         # Initialize LLM for prompt summarization
-        self.llm = ChatOpenAI(
-            model_name=self.config.llm.model,
-            temperature=0.3,  # Lower temperature for more consistent summarization
-            max_tokens=2000,
-            api_key=self.config.llm.api_key,
-            base_url=self.config.llm.base_url
-        )
+        self.llm = get_llm(self.config.llm, temperature=0.3, max_tokens=2000)  # Lower temperature for more consistent summarization
+        self.llm_rate_limiter = get_llm_rate_limiter(self.config.llm)
+        
+        # Summarization system message is static, so build it once
+        self._summarize_system_message = {"role": "system", "content": SUMMARIZE_SYSTEM_PROMPT}
     
     def _initialize_client(self):
         """Initialize client based on configured provider."""
@@ -118,9 +180,22 @@ class ImageGenerationTool:
             logger.error(f"Error initializing OpenRouter client: {e}")
     
     def _initialize_sd_client(self):
-        """Initialize Stable Diffusion client (placeholder for custom SD API)."""
-        logger.warning("Direct Stable Diffusion provider not yet implemented. Use openrouter-sd instead.")
-        # This can be extended to support direct SD API endpoints
+        """Initialize a local Stable Diffusion pipeline with diffusers."""
+        try:
+            import torch
+            
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            dtype = torch.float16 if device == "cuda" else torch.float32
+            
+            self.client = _load_sd_pipeline(self.config.image_gen.sd_model_id, device, dtype)
+            logger.info(f"Stable Diffusion pipeline initialized ({self.config.image_gen.sd_model_id} on {device})")
+        except ImportError:
+            logger.error("diffusers/torch not installed. Install with: pip install diffusers torch")
+    
+    @property
+    def supports_batch(self) -> bool:
+        """Whether the provider renders a list of prompts in a single batched call."""
+        return self.provider == "stable-diffusion" and self.client is not None
     
     def generate_image(
         self,
@@ -168,6 +243,8 @@ class ImageGenerationTool:
                 return self._generate_gemini(enhanced_prompt, output_path, character_reference_images)
             elif self.provider == "openrouter-sd":
                 return self._generate_openrouter_sd(enhanced_prompt, output_path, character_reference_images)
+            elif self.provider == "stable-diffusion":
+                return self._generate_sd_batch([enhanced_prompt], [output_path])[0]
             else:
                 logger.error(f"Image generation not implemented for provider: {self.provider}")
                 return None
@@ -402,6 +479,80 @@ class ImageGenerationTool:
             logger.debug(f"Traceback: {traceback.format_exc()}")
             return None
     
+    def _generate_sd_batch(self, prompts: List[str], output_paths: List[Path]) -> List[Optional[Path]]:
+        """Generate images for several prompts in one local Stable Diffusion forward pass.
+        
+        Args:
+            prompts: Enhanced generation prompts
+            output_paths: Paths to save the generated images (same order as prompts)
+        
+        Returns:
+            List of paths to generated images (None for failures)
+        """
+        try:
+            logger.info(f"Generating {len(prompts)} Stable Diffusion image(s) in one batch")
+            
+            with _SD_PIPELINE_LOCK:
+                images = self.client(
+                    prompt=prompts,
+                    num_inference_steps=self.config.image_gen.sd_steps,
+                    guidance_scale=self.config.image_gen.sd_cfg_scale,
+                    num_images_per_prompt=1
+                ).images
+            
+            results = []
+            for image, output_path in zip(images, output_paths):
+                image.save(output_path, "PNG")
+                
+                # Resize to 1920x1080 if needed
+                self._resize_image(output_path, target_size=(1920, 1080))
+                results.append(output_path)
+            
+            logger.info(f"Stable Diffusion batch of {len(results)} image(s) saved")
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error generating Stable Diffusion batch: {e}")
+            return [None] * len(prompts)
+    
+    def generate_images_batch(
+        self,
+        prompts: List[str],
+        output_paths: List[Path],
+        style: Optional[str] = None
+    ) -> List[Optional[Path]]:
+        """
+        Generate images for many prompts, batching them when the provider supports it.
+        
+        Local pipelines receive chunks of image_gen.batch_size prompts per call to stay
+        within GPU memory; API providers fall back to one request per prompt.
+        
+        Args:
+            prompts: Image generation prompts
+            output_paths: Paths to save the generated images (same order as prompts)
+            style: Optional art style override
+            
+        Returns:
+            List of paths to generated images (None for failures), in input order
+        """
+        if not self.supports_batch:
+            return [
+                self.generate_image(prompt=prompt, style=style, output_path=output_path)
+                for prompt, output_path in zip(prompts, output_paths)
+            ]
+        
+        enhanced_prompts = [self._enhance_prompt(prompt, style) for prompt in prompts]
+        batch_size = max(1, self.config.image_gen.batch_size)
+        
+        results = []
+        for start in range(0, len(enhanced_prompts), batch_size):
+            results.extend(self._generate_sd_batch(
+                enhanced_prompts[start:start + batch_size],
+                output_paths[start:start + batch_size]
+            ))
+        
+        return results
+    
     def analyze_character_image(
         self,
         image_path: Path,
@@ -562,35 +713,17 @@ Focus on concrete visual details that will ensure consistency across multiple sc
         try:
             logger.info(f"Character descriptions too long ({len(characters_str)} chars), summarizing with LLM...")
             
-            # Create summarization prompt
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", """You are an expert at condensing character descriptions for image generation.
-Your task is to summarize character descriptions while preserving ALL essential visual details needed for consistent image generation.
-
-CRITICAL: Keep these details for each character:
-- Character name and type
-- Physical appearance (body shape, size, colors)
-- Distinctive features (ears, tail, facial features, clothing)
-- Key personality traits that affect appearance
-- Art style characteristics
-
-Remove redundant phrases and verbose explanations, but NEVER remove visual details."""),
-                ("human", """Summarize the following character descriptions to approximately {target_length} characters while preserving all essential visual details:
-
-{characters_str}
-
-Provide a concise version that maintains character consistency for image generation.""")
-            ])
-            
             # Calculate target length (aim for 80% of max to leave room)
             target_length = int(max_length * 0.8)
             
             # Format and invoke LLM
-            formatted_prompt = prompt.format_messages(
+            human_message = SUMMARIZE_HUMAN_PROMPT.format(
                 characters_str=characters_str,
                 target_length=target_length
             )
+            formatted_prompt = [self._summarize_system_message, {"role": "user", "content": human_message}]
             
+            self.llm_rate_limiter.acquire(estimate_request_tokens(formatted_prompt, self.config.llm, max_tokens=2000))
             response = self.llm.invoke(formatted_prompt)
             summarized = sanitize_text(response.content).strip()
             
@@ -605,6 +738,72 @@ Provide a concise version that maintains character consistency for image generat
             return characters_str[:max_length - 3] + "..."
     
     
+    def summarize_character_descriptions_batch(
+        self,
+        descriptions: List[str],
+        max_length: int = 2000
+    ) -> List[str]:
+        """
+        Summarize many character descriptions with one LLM call per batch.
+        
+        Descriptions within max_length are returned unchanged. The rest are numbered and
+        sent together (up to SUMMARY_BATCH_SIZE per call) so the instruction header is
+        paid once per batch instead of once per description.
+        
+        Args:
+            descriptions: Character description strings
+            max_length: Maximum allowed length before summarization
+            
+        Returns:
+            List of original or summarized descriptions, in input order
+        """
+        results = list(descriptions)
+        pending = [i for i, text in enumerate(descriptions) if len(text) > max_length]
+        if not pending:
+            return results
+        
+        target_length = int(max_length * 0.8)
+        
+        for start in range(0, len(pending), SUMMARY_BATCH_SIZE):
+            batch = pending[start:start + SUMMARY_BATCH_SIZE]
+            logger.info(f"Summarizing {len(batch)} character description(s) in one batched LLM call")
+            
+            numbered = "\n\n".join(
+                f"[{number}]\n{descriptions[index]}" for number, index in enumerate(batch, 1)
+            )
+            
+            summaries = {}
+            try:
+                human_message = BATCH_SUMMARIZE_HUMAN_PROMPT.format(
+                    count=len(batch),
+                    target_length=target_length,
+                    entries=numbered
+                )
+                formatted_prompt = [self._summarize_system_message, {"role": "user", "content": human_message}]
+                
+                # Scale the completion budget with the number of entries in the batch
+                max_tokens = max(2000, len(batch) * target_length // 2)
+                self.llm_rate_limiter.acquire(estimate_request_tokens(formatted_prompt, self.config.llm, max_tokens=max_tokens))
+                response = self.llm.invoke(formatted_prompt, max_tokens=max_tokens)
+                payload = extract_json_text(sanitize_text(response.content))
+                
+                for item in fast_json_loads(payload):
+                    summaries[int(item["index"])] = str(item["summary"]).strip()
+                    
+            except Exception as e:
+                logger.error(f"Error in batched character summarization: {e}")
+            
+            for number, index in enumerate(batch, 1):
+                summary = summaries.get(number)
+                if summary:
+                    results[index] = summary
+                else:
+                    # Fallback: simple truncation with ellipsis
+                    logger.warning(f"Falling back to simple truncation at {max_length} characters for entry {number}")
+                    results[index] = descriptions[index][:max_length - 3] + "..."
+        
+        return results
+    
     def generate_character_reference(
         self,
         character_name: str,
@@ -624,9 +823,80 @@ Provide a concise version that maintains character consistency for image generat
         Returns:
             Path to character reference image, or None if generation failed
         """
-        # Create detailed prompt for character reference
+        prompt = self._build_character_reference_prompt(character_name, character_description, traits)
+        output_path = get_temp_path(f"character_ref_{character_name}.png", "images", self.workflow_id)
+        
+        # Reuse a previously generated image for the identical prompt and provider settings
+        cache_key = self._reference_cache_key(prompt, style)
+        cached_path = self._load_cached_reference(cache_key, output_path)
+        if cached_path:
+            logger.info(f"Using cached reference image for {character_name}")
+            return cached_path
+        
+        image_path = self.generate_image(
+            prompt=prompt,
+            character_name=character_name,
+            style=style,
+            output_path=output_path
+        )
+        
+        if image_path:
+            save_cached(IMAGE_CACHE_NAMESPACE, cache_key, {"path": str(image_path)})
+        
+        return image_path
+    
+    def generate_character_references_batch(
+        self,
+        characters: List[Dict[str, Any]],
+        style: Optional[str] = None
+    ) -> List[Optional[Path]]:
+        """
+        Generate character reference sheets for many characters in batched calls.
+        
+        Args:
+            characters: Dicts with 'name', 'description' and 'traits'
+            style: Optional art style
+            
+        Returns:
+            List of paths to character reference images (None for failures), in input order
+        """
+        results: List[Optional[Path]] = [None] * len(characters)
+        pending = []
+        
+        for index, char in enumerate(characters):
+            prompt = self._build_character_reference_prompt(char["name"], char["description"], char.get("traits", []))
+            output_path = get_temp_path(f"character_ref_{char['name']}.png", "images", self.workflow_id)
+            cache_key = self._reference_cache_key(prompt, style)
+            
+            cached_path = self._load_cached_reference(cache_key, output_path)
+            if cached_path:
+                logger.info(f"Using cached reference image for {char['name']}")
+                results[index] = cached_path
+            else:
+                pending.append((index, prompt, output_path, cache_key))
+        
+        if pending:
+            generated = self.generate_images_batch(
+                [prompt for _, prompt, _, _ in pending],
+                [output_path for _, _, output_path, _ in pending],
+                style=style
+            )
+            for (index, _, _, cache_key), image_path in zip(pending, generated):
+                if image_path:
+                    save_cached(IMAGE_CACHE_NAMESPACE, cache_key, {"path": str(image_path)})
+                results[index] = image_path
+        
+        return results
+    
+    def _build_character_reference_prompt(
+        self,
+        character_name: str,
+        character_description: str,
+        traits: List[str]
+    ) -> str:
+        """Create detailed prompt for a character reference sheet."""
         traits_str = ", ".join(traits)
-        prompt = (
+        return (
             f"Character reference sheet for {character_name}, "
             f"{character_description}, "
             f"traits: {traits_str}, "
@@ -634,15 +904,78 @@ Provide a concise version that maintains character consistency for image generat
             f"front view, side view, full body, "
             f"consistent design, character sheet style"
         )
+    
+    def _reference_cache_key(self, prompt: str, style: Optional[str]) -> str:
+        """Cache key for a reference image: identical prompt and provider settings."""
+        return stable_hash({
+            "prompt": prompt,
+            "style": style,
+            "provider": self.provider,
+            "model": self.config.image_gen.model,
+            "size": self.config.image_gen.size,
+        })
+    
+    def _load_cached_reference(self, cache_key: str, output_path: Path) -> Optional[Path]:
+        """Copy a cached reference image to output_path and return it, or None on a miss."""
+        cached = load_cached(IMAGE_CACHE_NAMESPACE, cache_key)
+        if not cached or not Path(cached.get("path", "")).exists():
+            return None
         
+        cached_path = Path(cached["path"])
+        if cached_path.resolve() != output_path.resolve():
+            shutil.copyfile(cached_path, output_path)
+        return output_path
+    
+    def copy_character_reference(self, image_path: Path, character_name: str) -> Optional[Path]:
+        """
+        Copy a reference image generated by another workflow into this workflow's images.
+        
+        Args:
+            image_path: Source image path
+            character_name: Name of the character
+            
+        Returns:
+            Path to the copied image, or None if copying failed
+        """
         output_path = get_temp_path(f"character_ref_{character_name}.png", "images", self.workflow_id)
+        try:
+            if Path(image_path).resolve() != output_path.resolve():
+                shutil.copyfile(image_path, output_path)
+            return output_path
+        except Exception as e:
+            logger.error(f"Error copying character reference {image_path}: {e}")
+            return None
+    
+    def build_scene_characters_str(
+        self,
+        characters: List[str],
+        character_references: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> str:
+        """
+        Build the (unsummarized) character details string for a scene prompt.
         
-        return self.generate_image(
-            prompt=prompt,
-            character_name=character_name,
-            style=style,
-            output_path=output_path
-        )
+        Args:
+            characters: List of character names in the scene
+            character_references: Optional dict mapping character names to character detail dicts
+            
+        Returns:
+            Character details joined for the scene prompt
+        """
+        if character_references and characters:
+            # Build detailed character descriptions at the start
+            char_details = []
+            for char_name in characters:
+                if char_name in character_references:
+                    char_info = character_references[char_name]
+                    character_detail = char_info.get('character_detail', char_name)
+                    char_details.append(character_detail)
+                else:
+                    char_details.append(char_name)
+            
+            return "; ".join(char_details)  # Use semicolon to separate characters
+        
+        # Fallback if no character references available
+        return ", ".join(characters) if characters else "no characters"
     
     def generate_scene_image(
         self,
@@ -654,7 +987,8 @@ Provide a concise version that maintains character consistency for image generat
         scene_number: int,
         character_references: Optional[Dict[str, Dict[str, Any]]] = None,
         scene_background: Optional[str] = None,
-        style: Optional[str] = None
+        style: Optional[str] = None,
+        characters_summary: Optional[str] = None
     ) -> Optional[Path]:
         """
         Generate an image for a specific scene.
@@ -670,10 +1004,84 @@ Provide a concise version that maintains character consistency for image generat
                                  Each dict should contain: 'character_detail', 'reference_image_path'
             scene_background: Optional detailed background description (2-3 sentences)
             style: Optional art style
+            characters_summary: Optional pre-summarized character details (skips per-scene summarization)
             
         Returns:
             Path to generated scene image, or None if generation failed
         """
+        prompt, output_path, character_reference_images = self.build_scene_prompt(
+            scene_description=scene_description,
+            scene_narration=scene_narration,
+            characters=characters,
+            setting=setting,
+            emotions=emotions,
+            scene_number=scene_number,
+            character_references=character_references,
+            scene_background=scene_background,
+            characters_summary=characters_summary
+        )
+        
+        # Pass character reference images to generate_image
+        return self.generate_image(
+            prompt=prompt,
+            scene_number=scene_number,
+            style=style,
+            output_path=output_path,
+            character_reference_images=character_reference_images if character_reference_images else None
+        )
+    
+    def generate_scene_images_batch(self, scenes: List[Dict[str, Any]]) -> List[Optional[Path]]:
+        """
+        Generate many scene images, batching them when the provider supports it.
+        
+        Args:
+            scenes: Keyword-argument dicts for generate_scene_image (one per scene, same style)
+            
+        Returns:
+            List of paths to generated scene images (None for failures), in input order
+        """
+        if not scenes:
+            return []
+        
+        style = scenes[0].get("style")
+        prompts, output_paths = [], []
+        for scene in scenes:
+            scene_kwargs = {key: value for key, value in scene.items() if key != "style"}
+            prompt, output_path, _ = self.build_scene_prompt(**scene_kwargs)
+            prompts.append(prompt)
+            output_paths.append(output_path)
+        
+        return self.generate_images_batch(prompts, output_paths, style=style)
+    
+    def build_scene_prompt(
+        self,
+        scene_description: str,
+        scene_narration: str,
+        characters: List[str],
+        setting: str,
+        emotions: List[str],
+        scene_number: int,
+        character_references: Optional[Dict[str, Dict[str, Any]]] = None,
+        scene_background: Optional[str] = None,
+        characters_summary: Optional[str] = None
+    ) -> tuple:
+        """
+        Build the prompt, output path and reference images for a scene.
+        
+        Args:
+            scene_description: Description of the scene
+            scene_narration: Narration of the scene
+            characters: List of character names in the scene
+            setting: Brief setting description (1-2 words)
+            emotions: List of emotions to convey
+            scene_number: Scene number
+            character_references: Optional dict mapping character names to character detail dicts
+            scene_background: Optional detailed background description (2-3 sentences)
+            characters_summary: Optional pre-summarized character details (skips per-scene summarization)
+            
+        Returns:
+            Tuple of (prompt, output path, character reference image paths by name)
+        """
         # Build comprehensive scene prompt with character details FIRST for consistency
         emotions_str = ", ".join(emotions) if emotions else "neutral"
         
@@ -690,24 +1098,14 @@ Provide a concise version that maintains character consistency for image generat
                         character_reference_images[char_name] = ref_image_path
         
         # Start with character details to ensure image generator prioritizes them
+        characters_str = self.build_scene_characters_str(characters, character_references)
         if character_references and characters:
-            # Build detailed character descriptions at the start
-            char_details = []
-            for char_name in characters:
-                if char_name in character_references:
-                    char_info = character_references[char_name]
-                    character_detail = char_info.get('character_detail', char_name)
-                    char_details.append(character_detail)
-                else:
-                    char_details.append(char_name)
-            
-            characters_str = "; ".join(char_details)  # Use semicolon to separate characters
-            
-            # Summarize character descriptions if too long
-            characters_str = self.summarize_character_descriptions(characters_str, max_length=2000)
-        else:
-            # Fallback if no character references available
-            characters_str = ", ".join(characters) if characters else "no characters"
+            if characters_summary is not None:
+                # Already condensed upstream (e.g. batched across scenes)
+                characters_str = characters_summary
+            else:
+                # Summarize character descriptions if too long
+                characters_str = self.summarize_character_descriptions(characters_str, max_length=2000)
 
         prompt = " ".join([f"**Scene**: {scene_description}, \n\n",
             f"**Narration**: {scene_narration}, \n\n",
@@ -719,15 +1117,124 @@ Provide a concise version that maintains character consistency for image generat
         
         output_path = get_temp_path(f"scene_{scene_number:03d}.png", "images", self.workflow_id)
         
-        # Pass character reference images to generate_image
-        return self.generate_image(
-            prompt=prompt,
-            scene_number=scene_number,
-            style=style,
-            output_path=output_path,
-            character_reference_images=character_reference_images if character_reference_images else None
+        return prompt, output_path, character_reference_images
+    
+    async def agenerate_character_reference(
+        self,
+        character_name: str,
+        character_description: str,
+        traits: List[str],
+        style: Optional[str] = None
+    ) -> Optional[Path]:
+        """
+        Async variant of generate_character_reference.
+        
+        The provider SDKs used here are synchronous, so the call is offloaded to a
+        worker thread to let the event loop overlap multiple requests.
+        """
+        return await asyncio.to_thread(
+            self.generate_character_reference,
+            character_name=character_name,
+            character_description=character_description,
+            traits=traits,
+            style=style
         )
     
+    async def aanalyze_character_image(
+        self,
+        image_path: Path,
+        character_name: str,
+        character_type: str
+    ) -> Optional[str]:
+        """Async variant of analyze_character_image."""
+        return await asyncio.to_thread(
+            self.analyze_character_image,
+            image_path=image_path,
+            character_name=character_name,
+            character_type=character_type
+        )
+    
+    async def agenerate_scene_image(self, **kwargs: Any) -> Optional[Path]:
+        """Async variant of generate_scene_image (accepts the same keyword arguments)."""
+        return await asyncio.to_thread(self.generate_scene_image, **kwargs)
+    
+    def submit_scene_image_job(self, **kwargs: Any) -> str:
+        """
+        Submit a scene image generation job and return without waiting for it.
+        
+        None of the supported providers expose asynchronous job endpoints, so jobs run
+        on the tool's worker pool; callers submit every scene up front and then wait
+        on the job IDs, leaving throughput bounded by the pool rather than the caller.
+        
+        Args:
+            **kwargs: Same keyword arguments as generate_scene_image
+            
+        Returns:
+            Job ID to pass to await_job
+        """
+        job_id = uuid.uuid4().hex
+        self._jobs[job_id] = self._job_executor.submit(self.generate_scene_image, **kwargs)
+        return job_id
+    
+    async def await_job(self, job_id: str) -> Optional[Path]:
+        """
+        Wait for a submitted image job to finish.
+        
+        Args:
+            job_id: Job ID from submit_scene_image_job
+            
+        Returns:
+            Path to generated image, or None if the job failed or is unknown
+        """
+        future = self._jobs.pop(job_id, None)
+        if future is None:
+            logger.warning(f"Unknown image job: {job_id}")
+            return None
+        
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Image job {job_id} failed: {e}")
+            return None
+    
+    def cancel_job(self, job_id: str) -> bool:
+        """
+        Drop a submitted image job that will never be awaited.
+        
+        The job is cancelled if it has not started yet; a running job finishes on the
+        pool, but its result is discarded.
+        
+        Args:
+            job_id: Job ID from submit_scene_image_job
+            
+        Returns:
+            True if the job was still pending and got cancelled
+        """
+        future = self._jobs.pop(job_id, None)
+        return future is not None and future.cancel()
+    
+    def copy_scene_image(self, image_path: Path, scene_number: int) -> Optional[Path]:
+        """
+        Copy an already generated image to another scene's output path.
+        
+        Args:
+            image_path: Source image path
+            scene_number: Scene number of the copy
+            
+        Returns:
+            Path to the copied image, or None if copying failed
+        """
+        output_path = get_temp_path(f"scene_{scene_number:03d}.png", "images", self.workflow_id)
+        try:
+            if Path(image_path) != output_path:
+                shutil.copyfile(image_path, output_path)
+            return output_path
+        except Exception as e:
+            logger.error(f"Error copying scene image {image_path}: {e}")
+            return None
+    
     def generate_multiple_images(
         self,
         prompts: List[str],
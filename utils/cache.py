@@ -0,0 +1,148 @@
+"""Exact-match disk caches for LLM responses and generated assets."""
+
+import sqlite3
+import hashlib
+import logging
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from config import get_config
+from utils.helpers import get_temp_path, fast_json_loads, fast_json_dumps, stable_json_dumps
+
+logger = logging.getLogger(__name__)
+
+
+def stable_hash(payload: Any) -> str:
+    """
+    Compute a stable hash of JSON-serializable inputs.
+
+    Args:
+        payload: Inputs to hash (dict keys are sorted, unknown types are stringified)
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    return hashlib.sha256(stable_json_dumps(payload)).hexdigest()
+
+
+def load_cached(namespace: str, key: str) -> Optional[Any]:
+    """
+    Load a cached value.
+
+    Args:
+        namespace: Cache namespace (subdirectory under the temp directory)
+        key: Cache key from stable_hash
+
+    Returns:
+        Cached value, or None on a miss or when caching is disabled
+    """
+    if not get_config().enable_response_cache:
+        return None
+
+    cache_path = get_temp_path(f"{key}.json", namespace)
+    if not cache_path.exists():
+        return None
+
+    try:
+        value = fast_json_loads(cache_path.read_bytes())
+        logger.debug(f"Cache hit: {namespace}/{key[:12]}")
+        return value
+    except Exception as e:
+        logger.warning(f"Error reading cache entry {cache_path}: {e}")
+        return None
+
+
+def save_cached(namespace: str, key: str, value: Any):
+    """
+    Store a value in the cache.
+
+    Args:
+        namespace: Cache namespace (subdirectory under the temp directory)
+        key: Cache key from stable_hash
+        value: JSON-serializable value
+    """
+    if not get_config().enable_response_cache:
+        return
+
+    cache_path = get_temp_path(f"{key}.json", namespace)
+    try:
+        # Write to a temp file first so concurrent readers never see partial JSON
+        tmp_path = cache_path.with_suffix(".json.tmp")
+        tmp_path.write_bytes(fast_json_dumps(value))
+        tmp_path.replace(cache_path)
+    except Exception as e:
+        logger.warning(f"Error writing cache entry {cache_path}: {e}")
+
+
+class CharacterReferenceIndex:
+    """
+    Persistent index of character reference images keyed by character identity.
+
+    Backed by SQLite so that parallel workers and separate pipeline runs can share
+    the store safely.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        """
+        Initialize the index.
+
+        Args:
+            db_path: Optional database path (defaults to temp/char_ref_index.sqlite)
+        """
+        self.db_path = db_path or get_temp_path("char_ref_index.sqlite")
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS refs (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a short-lived connection (connections are not shared across threads)."""
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up an indexed reference.
+
+        Args:
+            key: Identity key from stable_hash
+
+        Returns:
+            Stored entry, or None on a miss, when caching is disabled, or if the image is gone
+        """
+        if not get_config().enable_response_cache:
+            return None
+
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute("SELECT value FROM refs WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Error reading character reference index: {e}")
+            return None
+
+        if not row:
+            return None
+
+        entry = fast_json_loads(row[0])
+        if not entry.get("reference_image_path") or not Path(entry["reference_image_path"]).exists():
+            return None
+        return entry
+
+    def put(self, key: str, entry: Dict[str, Any]):
+        """
+        Insert or replace an indexed reference.
+
+        Args:
+            key: Identity key from stable_hash
+            entry: JSON-serializable entry (must include 'reference_image_path')
+        """
+        if not get_config().enable_response_cache:
+            return
+
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO refs (key, value) VALUES (?, ?)",
+                    (key, fast_json_dumps(entry).decode("utf-8"))
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Error writing character reference index: {e}")
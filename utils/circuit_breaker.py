@@ -0,0 +1,88 @@
+"""Circuit breaker that fails fast while an external provider is down."""
+
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After `failure_threshold` consecutive failures the circuit opens and requests are
+    rejected until `reset_timeout` seconds have passed. The next request is then let
+    through as a trial while the others are still rejected: success closes the circuit,
+    failure opens it again. Safe to share across threads.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            name: Name used in log messages
+            failure_threshold: Consecutive failures before the circuit opens
+            reset_timeout: Seconds to stay open before allowing a trial request
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.failure_count = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def _rejecting(self) -> bool:
+        """Whether requests are rejected right now (caller holds the lock)."""
+        if self.opened_at is None:
+            return False
+        return self._trial_in_flight or time.monotonic() - self.opened_at < self.reset_timeout
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the circuit is currently rejecting requests."""
+        with self._lock:
+            return self._rejecting()
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a request may be issued.
+
+        After the reset timeout only the first caller is allowed through, as the trial
+        request; the caller must report its outcome with record_success or record_failure.
+
+        Returns:
+            False while the circuit is open or a trial is in flight, True otherwise
+        """
+        with self._lock:
+            if self._rejecting():
+                return False
+            if self.opened_at is not None:
+                logger.info(f"Circuit '{self.name}' half-open, allowing a trial request")
+                self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        """Close the circuit after a successful request."""
+        with self._lock:
+            if self.opened_at is not None:
+                logger.info(f"Circuit '{self.name}' closed")
+            self.failure_count = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        """Count a failed request and open the circuit once the threshold is reached."""
+        with self._lock:
+            self._trial_in_flight = False
+            self.failure_count += 1
+            if self.failure_count >= self.failure_threshold:
+                if self.opened_at is None or time.monotonic() - self.opened_at >= self.reset_timeout:
+                    logger.warning(
+                        f"Circuit '{self.name}' opened after {self.failure_count} consecutive failures, "
+                        f"failing fast for {self.reset_timeout:.0f}s"
+                    )
+                self.opened_at = time.monotonic()
@@ -1,14 +1,38 @@
 """Helper functions for logging, file management, and cost estimation."""
 
+import re
 import logging
 import sys
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Union
 from datetime import datetime
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from config import get_config
 
+# Markdown code fence around a JSON response
+JSON_FENCE_PATTERN = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+# ASCII replacements for common problematic Unicode characters, applied by sanitize_text
+SANITIZE_REPLACEMENTS = (
+    ('\u2192', '->'),   # Right arrow
+    ('\u2190', '<-'),   # Left arrow
+    ('\u2194', '<->'), # Left-right arrow
+    ('\u2022', '*'),    # Bullet point
+    ('\u2013', '-'),    # En dash
+    ('\u2014', '--'),   # Em dash
+    ('\u201c', '"'),    # Left double quote
+    ('\u201d', '"'),    # Right double quote
+    ('\u2018', "'"),    # Left single quote
+    ('\u2019', "'"),    # Right single quote
+    ('\u2026', '...'), # Horizontal ellipsis
+)
+
 
 def setup_logging(log_level: str = "INFO", log_file: Optional[str] = None) -> logging.Logger:
     """
@@ -281,29 +305,123 @@ def sanitize_text(text: str) -> str:
     if not isinstance(text, str):
         return str(text)
     
-    # Replace common problematic Unicode characters
-    replacements = {
-        '\u2192': '->',   # Right arrow
-        '\u2190': '<-',   # Left arrow
-        '\u2194': '<->', # Left-right arrow
-        '\u2022': '*',    # Bullet point
-        '\u2013': '-',    # En dash
-        '\u2014': '--',   # Em dash
-        '\u201c': '"',    # Left double quote
-        '\u201d': '"',    # Right double quote
-        '\u2018': "'",    # Left single quote
-        '\u2019': "'",    # Right single quote
-        '\u2026': '...', # Horizontal ellipsis
-    }
+    # Pure-ASCII text (the common case) needs no changes; str.isascii() is O(1)
+    if text.isascii():
+        return text
     
-    for unicode_char, replacement in replacements.items():
+    # Replace common problematic Unicode characters (str.replace beats str.translate
+    # with multi-character replacements on non-ASCII text)
+    for unicode_char, replacement in SANITIZE_REPLACEMENTS:
         text = text.replace(unicode_char, replacement)
     
     # Handle any remaining non-ASCII characters
-    try:
-        text.encode('ascii')
-    except UnicodeEncodeError:
-        # Replace remaining problematic characters
+    if not text.isascii():
         text = text.encode('ascii', errors='replace').decode('ascii')
     
     return text
+
+
+def fast_json_loads(data: Union[str, bytes]) -> Any:
+    """
+    Parse JSON with orjson when available, otherwise the standard library.
+    
+    Args:
+        data: JSON text or UTF-8 bytes
+        
+    Returns:
+        Parsed value (raises ValueError on invalid JSON)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def fast_json_dumps(payload: Any) -> bytes:
+    """
+    Serialize a payload to compact JSON bytes with orjson when available.
+
+    Args:
+        payload: JSON-serializable value
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def stable_json_dumps(payload: Any) -> bytes:
+    """
+    Serialize a payload to compact JSON bytes with sorted keys.
+    
+    orjson and the standard library fallback produce the same output for plain
+    JSON data, so hashes of the result do not depend on which one is installed.
+    
+    Args:
+        payload: Value to serialize (unknown types are stringified)
+        
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(payload, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, sort_keys=True, default=str, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def extract_json_text(text: str) -> str:
+    """
+    Extract the JSON document from an LLM response.
+    
+    Handles responses wrapped in a markdown code fence or surrounded by prose, whether
+    the document is an object or an array (whichever opens first is taken).
+    
+    Args:
+        text: Raw LLM response text
+        
+    Returns:
+        JSON text (the stripped input if no object or array is found)
+    """
+    fenced = JSON_FENCE_PATTERN.search(text)
+    if fenced:
+        text = fenced.group(1)
+    
+    starts = [index for index in (text.find("{"), text.find("[")) if index != -1]
+    if not starts:
+        return text.strip()
+    start = min(starts)
+    end = text.rfind("}" if text[start] == "{" else "]")
+    if end < start:
+        return text.strip()
+    return text[start:end + 1]
+
+
+def format_characters_and_setting(context: Dict[str, Any]) -> str:
+    """
+    Format a context's characters and setting for scene segmentation prompts.
+    
+    Args:
+        context: Context dictionary
+        
+    Returns:
+        Formatted context string
+    """
+    parts = []
+    
+    # Characters
+    characters = context.get("characters", [])
+    if characters:
+        parts.append("Characters:")
+        for char in characters:
+            name = char.get("name", "Unknown")
+            char_type = char.get("type", "unknown")
+            traits = char.get("traits", [])
+            traits_str = ", ".join(traits) if traits else "none"
+            parts.append(f"  - {name} ({char_type}): {traits_str}")
+    
+    # Setting
+    setting = context.get("setting", "")
+    if setting:
+        parts.append(f"\nSetting: {setting}")
+    
+    return "\n".join(parts)
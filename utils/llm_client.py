@@ -0,0 +1,169 @@
+"""Shared LangChain chat model clients."""
+
+import asyncio
+import logging
+import weakref
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+import httpx
+from langchain_openai import ChatOpenAI
+
+try:
+    from openai import DefaultAioHttpClient
+except ImportError:
+    DefaultAioHttpClient = None
+
+logger = logging.getLogger(__name__)
+
+# Connection pool shared by every chat model created here
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+
+class _LoopSessions:
+    """aiohttp-backed chat models opened on one event loop, and the callers using them."""
+
+    def __init__(self):
+        self.users = 0
+        self.llms: Dict[Tuple[Any, ...], ChatOpenAI] = {}
+
+
+# Open sessions per event loop, since aiohttp sessions are bound to the loop that opened them
+_loop_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopSessions]" = weakref.WeakKeyDictionary()
+
+
+@lru_cache(maxsize=None)
+def _shared_http_client() -> httpx.Client:
+    """Create the pooled HTTP client shared by all sync LLM calls."""
+    return httpx.Client(limits=HTTP_LIMITS, timeout=httpx.Timeout(600.0, connect=10.0))
+
+
+def _build_llm(
+    model: str,
+    temperature: float,
+    max_tokens: Optional[int],
+    api_key: Optional[str],
+    base_url: Optional[str],
+    http_async_client: Optional[Any] = None
+) -> ChatOpenAI:
+    """Build a chat model on the shared sync connection pool."""
+    logger.debug(f"Creating shared ChatOpenAI client for {model} (temperature={temperature})")
+    return ChatOpenAI(
+        model_name=model,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        api_key=api_key,
+        base_url=base_url,
+        http_client=_shared_http_client(),
+        http_async_client=http_async_client
+    )
+
+
+@lru_cache(maxsize=None)
+def _create_llm(
+    model: str,
+    temperature: float,
+    max_tokens: Optional[int],
+    api_key: Optional[str],
+    base_url: Optional[str]
+) -> ChatOpenAI:
+    """Create a chat model; cached so equal settings share one instance."""
+    return _build_llm(model, temperature, max_tokens, api_key, base_url)
+
+
+def _llm_settings(llm_config: Any, temperature: Optional[float], max_tokens: Optional[int]) -> Tuple[Any, ...]:
+    """Resolve the settings that identify a chat model, applying overrides."""
+    return (
+        llm_config.model,
+        llm_config.temperature if temperature is None else temperature,
+        llm_config.max_tokens if max_tokens is None else max_tokens,
+        llm_config.api_key,
+        llm_config.base_url
+    )
+
+
+def get_llm(llm_config: Any, temperature: Optional[float] = None, max_tokens: Optional[int] = None) -> ChatOpenAI:
+    """
+    Get the shared chat model for an LLM configuration.
+
+    Agents with the same model settings reuse one ChatOpenAI instance and all of them
+    share a single HTTP connection pool, so concurrent pipeline stages do not each pay
+    for their own TCP/TLS handshakes.
+
+    Args:
+        llm_config: LLM configuration (e.g. config.llm or config.script_segmenter_llm)
+        temperature: Optional temperature overriding the configured one
+        max_tokens: Optional max tokens overriding the configured one
+
+    Returns:
+        Shared ChatOpenAI instance
+    """
+    return _create_llm(*_llm_settings(llm_config, temperature, max_tokens))
+
+
+def get_async_llm(llm_config: Any, temperature: Optional[float] = None, max_tokens: Optional[int] = None) -> ChatOpenAI:
+    """
+    Get the chat model for async calls made from the running event loop.
+
+    Same as get_llm, unless the configuration sets async_http_backend to "aiohttp" and
+    the caller is inside async_llm_session: async requests then go through an aiohttp
+    session owned by the running loop, which holds up better than httpx when many
+    requests are in flight at once. Outside a session the shared httpx model is
+    returned, since nothing would close an aiohttp session opened there.
+
+    Args:
+        llm_config: LLM configuration (e.g. config.script_segmenter_llm)
+        temperature: Optional temperature overriding the configured one
+        max_tokens: Optional max tokens overriding the configured one
+
+    Returns:
+        ChatOpenAI instance usable from the running event loop
+    """
+    if getattr(llm_config, "async_http_backend", "httpx") != "aiohttp" or DefaultAioHttpClient is None:
+        return get_llm(llm_config, temperature, max_tokens)
+
+    sessions = _loop_sessions.get(asyncio.get_running_loop())
+    if sessions is None:
+        return get_llm(llm_config, temperature, max_tokens)
+
+    settings = _llm_settings(llm_config, temperature, max_tokens)
+    llm = sessions.llms.get(settings)
+    if llm is None:
+        try:
+            http_async_client = DefaultAioHttpClient(limits=HTTP_LIMITS)
+        except RuntimeError as e:
+            # openai installed without its aiohttp extra
+            logger.warning(f"aiohttp transport unavailable, using httpx: {e}")
+            llm = get_llm(llm_config, temperature, max_tokens)
+        else:
+            llm = _build_llm(*settings, http_async_client=http_async_client)
+        sessions.llms[settings] = llm
+    return llm
+
+
+@asynccontextmanager
+async def async_llm_session() -> AsyncIterator[None]:
+    """
+    Keep the aiohttp sessions handed out by get_async_llm open while the block runs.
+
+    Sessions are counted per event loop: nested or overlapping blocks on the same loop
+    share them, and they are closed only when the last block exits, so one caller
+    finishing never closes a session another task is still using.
+    """
+    loop = asyncio.get_running_loop()
+    sessions = _loop_sessions.get(loop)
+    if sessions is None:
+        sessions = _loop_sessions[loop] = _LoopSessions()
+    sessions.users += 1
+    try:
+        yield
+    finally:
+        sessions.users -= 1
+        if sessions.users == 0:
+            # Detach first, so callers entering while the close runs open fresh sessions
+            del _loop_sessions[loop]
+            for llm in sessions.llms.values():
+                # Models falling back to the shared httpx pool have no client of their own
+                if llm.http_async_client is not None:
+                    await llm.http_async_client.aclose()
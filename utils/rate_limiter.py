@@ -0,0 +1,215 @@
+"""Token-bucket rate limiting for parallel LLM and image API calls."""
+
+import time
+import asyncio
+import logging
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from config import get_config
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_tokens(text: str, model: Optional[str] = None) -> int:
+    """
+    Estimate the token count of a prompt.
+
+    Uses tiktoken when available, otherwise falls back to ~4 characters per token.
+
+    Args:
+        text: Prompt text
+        model: Optional model name used to select the tiktoken encoding
+
+    Returns:
+        Estimated number of tokens (at least 1)
+    """
+    if not text:
+        return 1
+
+    try:
+        import tiktoken
+
+        try:
+            encoding = tiktoken.encoding_for_model(model.split("/")[-1]) if model else tiktoken.get_encoding("cl100k_base")
+        except KeyError:
+            encoding = tiktoken.get_encoding("cl100k_base")
+        return max(1, len(encoding.encode(text)))
+    except Exception:
+        return max(1, len(text) // 4)
+
+
+class TokenBucketRateLimiter:
+    """
+    Proactive request/token throttle based on the OpenAI cookbook parallel processor.
+
+    Request and token capacity replenish continuously at the configured per-minute
+    rates; callers block until enough capacity is available before issuing a call.
+    Safe to share across threads and event loops.
+    """
+
+    def __init__(
+        self,
+        max_requests_per_minute: float,
+        max_tokens_per_minute: Optional[float] = None,
+        poll_interval: float = 0.05
+    ):
+        """
+        Initialize rate limiter.
+
+        Args:
+            max_requests_per_minute: Maximum requests per minute
+            max_tokens_per_minute: Maximum tokens per minute (None disables token limiting)
+            poll_interval: Seconds to sleep between capacity checks
+        """
+        self.max_requests_per_minute = float(max_requests_per_minute)
+        self.max_tokens_per_minute = float(max_tokens_per_minute) if max_tokens_per_minute else None
+        self.poll_interval = poll_interval
+
+        self.available_request_capacity = self.max_requests_per_minute
+        self.available_token_capacity = self.max_tokens_per_minute
+        self.last_update_time = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _replenish(self):
+        """Add capacity proportional to the time elapsed since the last update."""
+        now = time.monotonic()
+        elapsed = now - self.last_update_time
+        self.last_update_time = now
+
+        self.available_request_capacity = min(
+            self.available_request_capacity + self.max_requests_per_minute * elapsed / 60.0,
+            self.max_requests_per_minute
+        )
+        if self.max_tokens_per_minute is not None:
+            self.available_token_capacity = min(
+                self.available_token_capacity + self.max_tokens_per_minute * elapsed / 60.0,
+                self.max_tokens_per_minute
+            )
+
+    def try_acquire(self, tokens: int = 0) -> bool:
+        """
+        Consume capacity for one request if available.
+
+        Args:
+            tokens: Estimated tokens consumed by the request
+
+        Returns:
+            True if capacity was consumed, False otherwise
+        """
+        with self._lock:
+            self._replenish()
+
+            # Never demand more than a full bucket, otherwise the call could never proceed
+            if self.max_tokens_per_minute is not None:
+                tokens = min(tokens, self.max_tokens_per_minute)
+
+            if self.available_request_capacity < 1:
+                return False
+            if self.max_tokens_per_minute is not None and self.available_token_capacity < tokens:
+                return False
+
+            self.available_request_capacity -= 1
+            if self.max_tokens_per_minute is not None:
+                self.available_token_capacity -= tokens
+            return True
+
+    def acquire(self, tokens: int = 0):
+        """
+        Block until capacity for one request is available.
+
+        Args:
+            tokens: Estimated tokens consumed by the request
+        """
+        waited = False
+        while not self.try_acquire(tokens):
+            if not waited:
+                logger.debug(f"Rate limit capacity exhausted, waiting (tokens={tokens})")
+                waited = True
+            time.sleep(self.poll_interval)
+
+    async def aacquire(self, tokens: int = 0):
+        """
+        Async variant of acquire that yields to the event loop while waiting.
+
+        Args:
+            tokens: Estimated tokens consumed by the request
+        """
+        waited = False
+        while not self.try_acquire(tokens):
+            if not waited:
+                logger.debug(f"Rate limit capacity exhausted, waiting (tokens={tokens})")
+                waited = True
+            await asyncio.sleep(self.poll_interval)
+
+
+@lru_cache(maxsize=None)
+def get_rate_limiter(
+    name: str,
+    max_requests_per_minute: float,
+    max_tokens_per_minute: Optional[float] = None
+) -> TokenBucketRateLimiter:
+    """
+    Get the process-wide rate limiter for a provider account.
+
+    RPM/TPM limits apply to the whole account rather than to one agent, so every caller
+    must draw from the same bucket; limiters are cached so equal settings share one.
+
+    Args:
+        name: Account name (e.g. "llm" or "image")
+        max_requests_per_minute: Maximum requests per minute
+        max_tokens_per_minute: Maximum tokens per minute (None disables token limiting)
+
+    Returns:
+        Shared TokenBucketRateLimiter
+    """
+    logger.debug(f"Creating shared '{name}' rate limiter ({max_requests_per_minute} RPM, {max_tokens_per_minute} TPM)")
+    return TokenBucketRateLimiter(max_requests_per_minute, max_tokens_per_minute)
+
+
+def get_llm_rate_limiter(llm_config: Any) -> TokenBucketRateLimiter:
+    """
+    Get the shared limiter for the provider account an LLM configuration calls.
+
+    Agent configurations pointing at the same API key and base URL share one bucket,
+    while agents configured with their own key or endpoint (e.g. SCRIPT_SEGMENTER_API_KEY)
+    get their own. Every account is limited by the config.llm RPM/TPM settings.
+
+    Args:
+        llm_config: LLM configuration the calls are sent with (e.g. config.script_segmenter_llm)
+
+    Returns:
+        Shared TokenBucketRateLimiter for that account
+    """
+    return _llm_account_rate_limiter(llm_config.api_key, llm_config.base_url)
+
+
+@lru_cache(maxsize=None)
+def _llm_account_rate_limiter(api_key: Optional[str], base_url: Optional[str]) -> TokenBucketRateLimiter:
+    """Create the limiter for one LLM account; cached so every caller shares it."""
+    limits = get_config().llm
+    logger.debug(f"Creating shared LLM rate limiter for {base_url or 'the default endpoint'} "
+                 f"({limits.max_requests_per_minute} RPM, {limits.max_tokens_per_minute} TPM)")
+    return TokenBucketRateLimiter(limits.max_requests_per_minute, limits.max_tokens_per_minute)
+
+
+def get_image_rate_limiter() -> TokenBucketRateLimiter:
+    """Get the shared limiter for the image provider account (config.image_gen RPM limit)."""
+    return get_rate_limiter("image", get_config().image_gen.max_requests_per_minute)
+
+
+def estimate_request_tokens(messages: List[Dict[str, Any]], llm_config: Any, max_tokens: Optional[int] = None) -> int:
+    """
+    Estimate the token cost of a chat request for rate limiting.
+
+    Args:
+        messages: Chat messages (dicts with a "content" string)
+        llm_config: LLM configuration the request is sent with
+        max_tokens: Optional completion token limit overriding the configured one
+
+    Returns:
+        Estimated prompt tokens plus the completion token budget
+    """
+    prompt_text = "\n".join(str(message["content"]) for message in messages)
+    return estimate_tokens(prompt_text, llm_config.model) + (max_tokens or llm_config.max_tokens or 0)
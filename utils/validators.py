@@ -1,6 +1,7 @@
 """Validation functions for input and content quality."""
 
 import re
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
 import logging
 
@@ -91,10 +92,13 @@ def validate_input(input_data: Dict[str, Any]) -> tuple[bool, Optional[str]]:
     return True, None
 
 
+@lru_cache(maxsize=64)
 def validate_age_appropriateness(content: str, age_group: str) -> tuple[bool, Optional[str]]:
     """
     Check if content is age-appropriate.
     
+    Cached, since a story is checked both by validate_story_quality and by its caller.
+    
     Args:
         content: Content to check (story, dialogue, etc.)
         age_group: Target age group ("3-5", "6-8", "9-12")